@@ -55,8 +55,10 @@ def binary_codegen(self, regalloc):
     elif self.operator == "shr":
         res += [ASMInstruction('lsr', args=[rd, param])]
     elif self.operator == "mod":
-        res += [ASMInstruction('add', args=[rd, param])]
+        # the destination can share the register of a source that dies
+        # here, so both sources are read before it's written
         res += [ASMInstruction('sub', args=[get_register_string(REG_SCRATCH), rb, f"#{italic('1')}"])]
+        res += [ASMInstruction('add', args=[rd, param])]
         res += [ASMInstruction('and', args=[rd, rd, get_register_string(REG_SCRATCH)])]
 
     # conditional operations
@@ -457,18 +459,41 @@ ReadInstruction.codegen = read_codegen
 def instruction_list_codegen(self, regalloc):
     res = []
 
-    if len(self.children) > 0:
-        for child in self.children:
-            try:
-                res += child.codegen(regalloc)
-            except RuntimeError as e:
-                raise RuntimeError(f"Child {child.type_repr()}, {id(child)} did not generate any code; error: {e}")
+    # this is the hottest loop of the code generation: dispatch directly
+    # on the type of the instruction instead of resolving the method
+    dispatch_table = CODEGEN_DISPATCH_TABLE
+    for child in self.children:
+        codegen = dispatch_table.get(type(child))
+        if codegen is None:
+            codegen = type(child).codegen
+
+        try:
+            res += codegen(child, regalloc)
+        except RuntimeError as e:
+            raise RuntimeError(f"Child {child.type_repr()}, {id(child)} did not generate any code; error: {e}")
     return res
 
 
 InstructionList.codegen = instruction_list_codegen
 
 
+# Maps each (concrete) IR instruction type to its codegen function
+CODEGEN_DISPATCH_TABLE = {
+    BinaryInstruction: binary_codegen,
+    UnaryInstruction: unary_codegen,
+    LabelInstruction: label_codegen,
+    BranchInstruction: branch_codegen,
+    LoadImmInstruction: loadimm_codegen,
+    LoadPointerInstruction: loadpointer_codegen,
+    LoadInstruction: load_codegen,
+    StoreInstruction: store_codegen,
+    CastInstruction: cast_codegen,
+    PrintInstruction: print_codegen,
+    ReadInstruction: read_codegen,
+    InstructionList: instruction_list_codegen
+}
+
+
 def block_codegen(self, regalloc):
     res = [ASMInstruction("", comment="new function")]
 
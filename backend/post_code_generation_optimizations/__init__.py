@@ -4,10 +4,16 @@
 of ASMInstructions"""
 
 from backend.post_code_generation_optimizations.add_literal_pools import add_literal_pools
+from backend.post_code_generation_optimizations.remove_redundant_fills import remove_redundant_fills
 from logger import h3
 
 
-def perform_post_code_generation_optimizations(code, optimization_level):
+def perform_post_code_generation_optimizations(code, optimization_level, debug_info):
+    if optimization_level > 1:
+        print(h3("REMOVE REDUNDANT FILLS"))
+        debug_info['remove_redundant_fills'] = []
+        code = remove_redundant_fills(code, debug_info)
+
     print(h3("ADD LITERAL POOLS"))
     code = add_literal_pools(code)
 
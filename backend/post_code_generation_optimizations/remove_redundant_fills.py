@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+"""
+Spilled variables are stored on the stack as soon as they are defined, and
+loaded back as late as possible: often the two things happen one after the other
+
+```
+str r9, [fp, #-20]  @ spill
+ldr r10, [fp, #-20]  @ fill
+```
+
+the value is still in the register that has just been spilled, so the fill
+doesn't need to access memory: if the register is the same it can be removed,
+otherwise it becomes a move between the two registers
+
+The same holds for any word stored in the frame and loaded right after, like
+a local variable, so the instructions are matched on their opcode and on the
+frame slot they access, not on their comments
+"""
+
+from backend.codegenhelp import ASMInstruction, get_register_string, REG_FP
+from logger import green
+
+
+# Returns True if the instruction accesses a word in the current frame
+def accesses_frame_slot(instruction, opcode):
+    return instruction.instruction == opcode and instruction.args[1].startswith(f"[{get_register_string(REG_FP)}, #")
+
+
+def remove_redundant_fills(code, debug_info):
+    new_code = []
+    removed = 0
+    replaced = 0
+
+    for instruction in code:
+        if accesses_frame_slot(instruction, 'ldr') and len(new_code) > 0:
+            previous = new_code[-1]
+            if accesses_frame_slot(previous, 'str') and previous.args[1] == instruction.args[1]:
+                if previous.args[0] == instruction.args[0]:
+                    removed += 1
+                    debug_info['remove_redundant_fills'] += [(instruction, None)]
+                    continue
+
+                # don't change the existing instruction, it's also in the debug info
+                move = ASMInstruction('mov', args=[instruction.args[0], previous.args[0]], comment='fill from register')
+                replaced += 1
+                debug_info['remove_redundant_fills'] += [(instruction, move)]
+                instruction = move
+
+        new_code.append(instruction)
+
+    print(green(f"Removed {removed} and replaced {replaced} redundant fill{'s' if replaced + removed != 1 else ''}"))
+
+    return new_code
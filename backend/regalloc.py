@@ -4,16 +4,15 @@
 Assumes that all temporaries can be allocated to any register (because of this,
 it does not work with non integer types)."""
 
+from array import array
+from heapq import heappush, heappop
+
 from logger import green, yellow, cyan, bold
 
 # the register of all spilled temporaries is set to SPILL_FLAG
 SPILL_FLAG = 999
 
 
-def remove_non_regs(set):
-    return {var for var in set if var.alloc_class == 'reg'}
-
-
 class RegisterAllocation(object):
     """Object that contains the information about where each temporary is
     allocated.
@@ -93,6 +92,59 @@ class RegisterAllocation(object):
         return res
 
 
+# The allocation itself, working only with integers: the intervals are
+# identified by their index in starts and ends (the last live instruction),
+# sorted by start point; returns the register assigned to each interval
+# (SPILL_FLAG if it's spilled) and the number of spills
+#
+# The active intervals are kept in two heaps: one by end point, to expire
+# them, and one by reversed end point, to find the spill candidate (the one
+# ending last, or started last if more than one end together). An interval
+# leaving one heap is only marked as not active, and it's discarded from the
+# other one when it reaches the top
+def linear_scan(starts, ends, nregs):
+    registers = array('i', [SPILL_FLAG]) * len(starts)
+    active = bytearray(len(starts))
+    ending_first = []  # heap of (end point, index)
+    ending_last = []  # heap of (-end point, -index)
+    free_regs = list(range(nregs - 3, -1, -1))  # stack, -2 for spill room
+    num_spill = 0
+
+    for current in range(len(starts)):
+        start = starts[current]
+
+        # expire old intervals
+        while ending_first and ending_first[0][0] < start:
+            not_live_candidate = heappop(ending_first)[1]
+            if active[not_live_candidate]:
+                active[not_live_candidate] = False
+                free_regs.append(registers[not_live_candidate])
+
+        if len(free_regs) == 0:
+            while not active[-ending_last[0][1]]:
+                heappop(ending_last)
+            to_spill = -ending_last[0][1]
+            # keep the longest interval
+            if ends[to_spill] > ends[current]:
+                # actually spill
+                registers[current] = registers[to_spill]
+                registers[to_spill] = SPILL_FLAG
+                active[to_spill] = False  # remove spill from active
+                heappop(ending_last)
+                active[current] = True  # add i to active
+                heappush(ending_first, (ends[current], current))
+                heappush(ending_last, (-ends[current], -current))
+            num_spill += 1
+
+        else:
+            registers[current] = free_regs.pop()
+            active[current] = True
+            heappush(ending_first, (ends[current], current))
+            heappush(ending_last, (-ends[current], -current))
+
+    return registers, num_spill
+
+
 class LinearScanRegisterAllocator(object):
     """The register allocator. Produces RegisterAllocation objects from a control
     flow graph."""
@@ -115,30 +167,27 @@ class LinearScanRegisterAllocator(object):
         inst_index = 0
         min_gen = {}
         max_use = {}
-        vars = set()
 
-        # get the index of the instruction when a variable is generated and when it is killed
+        # get the index of the instruction when a variable is generated and when it is killed;
+        # only the variables allocated to registers are considered, filtering them directly
+        # instead of building new sets for each instruction
         for bb in self.cfg:
             for instr in bb.instrs:
-                live_out = remove_non_regs(instr.live_out)
-                live_in = remove_non_regs(instr.live_in)
-
-                for out_var in live_out:
-                    if out_var not in min_gen:
+                for out_var in instr.live_out:
+                    if out_var.alloc_class == 'reg' and out_var not in min_gen:
                         min_gen[out_var] = inst_index
                         max_use[out_var] = inst_index
 
-                for in_var in live_in:
-                    max_use[in_var] = inst_index
-
-                vars |= live_out | live_in
+                for in_var in instr.live_in:
+                    if in_var.alloc_class == 'reg':
+                        max_use[in_var] = inst_index
 
                 inst_index += 1
 
-        for var in vars:
-            gen = min_gen[var]
-            kill = max_use[var]
-            self.var_liveness.insert(0, {"var": var, "interval": range(gen, kill)})
+        # every variable that is live somewhere has been used
+        vars = set(max_use)
+
+        self.var_liveness = [{"var": var, "interval": range(min_gen[var], max_use[var])} for var in vars]
 
         try:
             self.var_liveness.sort(key=lambda x: x['interval'][0])
@@ -156,41 +205,14 @@ class LinearScanRegisterAllocator(object):
 
         self.compute_liveness_intervals()
 
-        live = []
-        free_regs = set(range(0, self.nregs - 2))  # -2 for spill room
-        num_spill = 0
-
-        for live_interval in self.var_liveness:
-            start = live_interval["interval"][0]
-
-            # expire old intervals
-            i = 0
-            while i < len(live):
-                not_live_candidate = live[i]
-                if not_live_candidate["interval"][-1] < start:
-                    live.pop(i)
-                    free_regs.add(self.var_to_reg[not_live_candidate["var"]])
-                i += 1
-
-            if len(free_regs) == 0:
-                to_spill = live[-1]
-                # keep the longest interval
-                if to_spill["interval"][-1] > live_interval["interval"][-1]:
-                    # actually spill
-                    self.var_to_reg[live_interval["var"]] = self.var_to_reg[to_spill["var"]]
-                    self.var_to_reg[to_spill["var"]] = SPILL_FLAG
-                    live.pop(-1)  # remove spill from active
-                    live.append(live_interval)  # add i to active
-                else:
-                    self.var_to_reg[live_interval["var"]] = SPILL_FLAG
-                num_spill += 1
-
-            else:
-                self.var_to_reg[live_interval["var"]] = free_regs.pop()
-                live.append(live_interval)
+        # the intervals are scanned using their index in these parallel arrays
+        variables = [x["var"] for x in self.var_liveness]
+        starts = array('i', [x["interval"].start for x in self.var_liveness])
+        ends = array('i', [x["interval"].stop - 1 for x in self.var_liveness])  # last live instruction
 
-            # sort the active intervals by increasing end point
-            live.sort(key=lambda li: li['interval'][-1])
+        registers, num_spill = linear_scan(starts, ends, self.nregs)
+        for var, register in zip(variables, registers):
+            self.var_to_reg[var] = register
 
         return RegisterAllocation(self.var_to_reg, num_spill, self.nregs)
 
@@ -80,25 +80,17 @@ class BasicBlock():
 
     def graphviz_repr(self):
         """Print in graphviz dot format"""
+        bb_id = id(self)
         instrs = f"{self.labels}" + '\\n' if len(self.labels) else ''
         instrs += '\\n'.join([repr(i) for i in self.instrs])
-        res = f'{id(self)} [label="BB {id(self)}' + '\\n' + f'{instrs}"];\n'
+        lines = [f'{bb_id} [label="BB {bb_id}' + '\\n' + f'{instrs}"];\n']
         if self.next:
-            if len(self.next.live_in) > 0:
-                res += f'{id(self)} -> {id(self.next)} [label="{self.next.live_in}"];\n'
-            else:
-                res += f'{id(self)} -> {id(self.next)} [label="{{}}"];\n'
+            lines.append(f'{bb_id} -> {id(self.next)} [label="{self.next.live_in if len(self.next.live_in) > 0 else "{}"}"];\n')
         if self.target_bb:
-            if len(self.target_bb.live_in) > 0:
-                res += f'{id(self)} -> {id(self.target_bb)} [style=dashed,label="{self.target_bb.live_in}"];\n'
-            else:
-                res += f'{id(self)} -> {id(self.target_bb)} [style=dashed,label="{{}}"];\n'
+            lines.append(f'{bb_id} -> {id(self.target_bb)} [style=dashed,label="{self.target_bb.live_in if len(self.target_bb.live_in) > 0 else "{}"}"];\n')
         if not (self.next or self.target_bb):
-            if len(self.live_out) > 0:
-                res += f'{id(self)} -> exit{id(self.get_function())} [label="{self.live_out}"];\n'
-            else:
-                res += f'{id(self)} -> exit{id(self.get_function())} [label="{{}}"];\n'
-        return res
+            lines.append(f'{bb_id} -> exit{id(self.get_function())} [label="{self.live_out if len(self.live_out) > 0 else "{}"}"];\n')
+        return "".join(lines)
 
     def succ(self):
         return [s for s in [self.target_bb, self.next] if s]
@@ -128,9 +120,16 @@ class ControlFlowGraph(list):
         super().__init__()
         FunctionTree.navigate(create_basic_blocks, self, quiet=True)
 
+        # index the BasicBlocks by their labels once, instead of searching
+        # the whole list for the target of each branch
+        label_to_bb = {}
+        for bb in self:
+            for label in bb.labels:
+                label_to_bb.setdefault(label, bb)
+
         for bb in self:
             if bb.target:
-                bb.target_bb = self.find_target_bb(bb.target)
+                bb.target_bb = self.find_target_bb(bb.target, label_to_bb)
             bb.remove_useless_next()
 
     # return a dictionary of {FunctionDef: entry Basic Block}
@@ -149,28 +148,25 @@ class ControlFlowGraph(list):
 
     def cfg_to_dot(self):
         """Get the CFG in graphviz dot"""
-        dot = "digraph G {\n"
+        lines = ["digraph G {\n"]
         for n in self:
-            dot += n.graphviz_repr()
+            lines.append(n.graphviz_repr())
 
         heads = self.heads()
         for p in heads:
             bb = heads[p]
-            dot += f"{p.symbol.name} [shape=box];\n"
-            if len(bb.live_in):
-                dot += f'{p.symbol.name} -> {id(bb)} [label="{bb.live_in}"];\n'
-            else:
-                dot += f'{p.symbol.name} -> {id(bb)} [label="{{}}"];\n'
-        dot += "}\n"
-        return remove_formatting(dot)
-
-    def find_target_bb(self, label):
-        """Return the BB that contains a given label;
-        Support function for creating/exploring the CFG"""
-        for bb in self:
-            if label in bb.labels:
-                return bb
-        raise RuntimeError(f"Label {label} not found in any Basic Block")
+            lines.append(f"{p.symbol.name} [shape=box];\n")
+            lines.append(f'{p.symbol.name} -> {id(bb)} [label="{bb.live_in if len(bb.live_in) else "{}"}"];\n')
+        lines.append("}\n")
+        return remove_formatting("".join(lines))
+
+    def find_target_bb(self, label, label_to_bb):
+        """Return the BB that contains a given label, using an index of
+        the BBs by label; Support function for creating/exploring the CFG"""
+        try:
+            return label_to_bb[label]
+        except KeyError:
+            raise RuntimeError(f"Label {label} not found in any Basic Block")
 
 
 def convert_instruction_list_to_bbs(self, basic_blocks):
@@ -181,7 +177,7 @@ def convert_instruction_list_to_bbs(self, basic_blocks):
     labels = []
 
     for instruction in self.children:
-        if isinstance(instruction, LabelInstruction):
+        if type(instruction) is LabelInstruction:
             label = instruction.label
             if len(instructions) > 0:
                 bb = BasicBlock(instrs=instructions, labels=labels)
@@ -199,7 +195,7 @@ def convert_instruction_list_to_bbs(self, basic_blocks):
         instructions.append(instruction)
 
         # if this BranchInstruction is not a function call, it marks the end of a BasicBlock
-        if isinstance(instruction, BranchInstruction) and not instruction.is_call():
+        if type(instruction) is BranchInstruction and not instruction.is_call():
             bb = BasicBlock(instrs=instructions, labels=labels)
             instructions = []
 
@@ -231,8 +227,11 @@ InstructionList.convert_to_basic_blocks = convert_instruction_list_to_bbs
 # XXX: since this happens after the lowering, the only InstructionLists that
 #      will be converted are function bodies
 def create_basic_blocks(node, basic_blocks):
+    convert_to_basic_blocks = getattr(type(node), 'convert_to_basic_blocks', None)
+    if convert_to_basic_blocks is None:
+        return
+
     try:
-        node.convert_to_basic_blocks(basic_blocks)
+        convert_to_basic_blocks(node, basic_blocks)
     except AttributeError as e:
-        if e.name != "convert_to_basic_blocks":
-            raise RuntimeError(f"Raised AttributeError {e}")
+        raise RuntimeError(f"Raised AttributeError {e}")
@@ -23,28 +23,30 @@ def perform_liveness_analysis(cfg):
         bb.compute_instr_level_liveness()
 
 
+# The representation is built as a list of lines joined once at the end,
+# instead of growing a string for every line
 def liveness_analysis_representation(cfg):
-    res = ""
+    res = []
 
     for bb in cfg:
-        res += f"{bb}\n"
+        res.append(f"{bb}\n")
 
-        res += yellow("Liveness Sets") + " {\n"
-        res += ii(f"{blue('Gen set:')} {bb.gen},\n")
-        res += ii(f"{blue('Kill set:')} {bb.kill},\n\n")
-        res += ii(f"{blue('Live in set:')} {bb.live_in},\n")
-        res += ii(f"{blue('Live out set:')} {bb.live_out}\n")
-        res += "}\n\n"
+        res.append(yellow("Liveness Sets") + " {\n")
+        res.append(ii(f"{blue('Gen set:')} {bb.gen},\n"))
+        res.append(ii(f"{blue('Kill set:')} {bb.kill},\n\n"))
+        res.append(ii(f"{blue('Live in set:')} {bb.live_in},\n"))
+        res.append(ii(f"{blue('Live out set:')} {bb.live_out}\n"))
+        res.append("}\n\n")
 
-        res += yellow("Instruction liveness") + " {\n"
+        res.append(yellow("Instruction liveness") + " {\n")
         for i in bb.instrs:
-            res += ii(f"{blue('Instruction:')} '{i}' " + "{\n")
-            res += di(f"{cyan('Live in set:')} {i.live_in},\n")
-            res += di(f"{cyan('Live out set:')} {i.live_out}\n")
-            res += ii("}\n")
-        res += "}\n\n---\n\n"
+            res.append(ii(f"{blue('Instruction:')} '{i}' " + "{\n"))
+            res.append(di(f"{cyan('Live in set:')} {i.live_in},\n"))
+            res.append(di(f"{cyan('Live out set:')} {i.live_out}\n"))
+            res.append(ii("}\n"))
+        res.append("}\n\n---\n\n")
 
-    return res
+    return "".join(res)
 
 
 def liveness_iteration(self):
@@ -24,7 +24,8 @@ def perform_chain_load_store_elimination(bb, debug_info):
     mapping = {}
 
     for instruction in bb.instrs:
-        if not isinstance(instruction, (StoreInstruction, LoadInstruction)):
+        instruction_type = type(instruction)
+        if instruction_type is not StoreInstruction and instruction_type is not LoadInstruction:
             continue
 
         # do not delete chains involving pointers
@@ -32,11 +33,11 @@ def perform_chain_load_store_elimination(bb, debug_info):
             continue
 
         # XXX: can we do this also for non temporaries?
-        if isinstance(instruction, StoreInstruction):
+        if instruction_type is StoreInstruction:
             if not instruction.dest.is_temporary:
                 continue
 
-        if isinstance(instruction, LoadInstruction):
+        if instruction_type is LoadInstruction:
             if not instruction.source.is_temporary:
                 continue
 
@@ -6,8 +6,10 @@ useless if the variable it modifies is not used after it"""
 from logger import green
 
 
+# The instructions of the BasicBlock are compacted in place, instead of
+# removing the useless ones one by one
 def perform_dead_variable_elimination(bb, debug_info):
-    keep_going = False
+    kept = 0
 
     for instruction in bb.instrs:
         live_out_set = instruction.live_out
@@ -16,10 +18,15 @@ def perform_dead_variable_elimination(bb, debug_info):
         # an instruction is useless if the variable it modifies ("kills")
         # is not used ("live") after it
         if kill_set != set() and kill_set.intersection(live_out_set) == set():
-            bb.remove(instruction)
             instruction.parent.remove(instruction)
             print(f"{green('Removed useless instruction')} {instruction}")
             debug_info['dead_variable_elimination'] += [instruction]
-            keep_going = True
+            continue
+
+        bb.instrs[kept] = instruction
+        kept += 1
+
+    keep_going = kept < len(bb.instrs)
+    del bb.instrs[kept:]
 
     return keep_going
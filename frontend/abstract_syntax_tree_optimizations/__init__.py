@@ -5,6 +5,7 @@ on the nodes of the AST"""
 
 from frontend.abstract_syntax_tree_optimizations.node_expansion import perform_node_expansion
 from frontend.abstract_syntax_tree_optimizations.loop_unrolling import perform_loop_unrolling
+from frontend.abstract_syntax_tree_optimizations.array_scalarization import perform_array_scalarization
 from logger import h3
 
 
@@ -15,3 +16,6 @@ def perform_abstract_syntax_tree_optimizations(program, optimization_level, debu
     if optimization_level > 1:
         print(h3("LOOP UNROLLING"))
         perform_loop_unrolling(program, debug_info)
+
+        print(h3("ARRAY SCALARIZATION"))
+        perform_array_scalarization(program, debug_info)
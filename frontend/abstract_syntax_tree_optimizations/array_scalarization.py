@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+
+"""Arrays can't be promoted to registers, since their address is needed to
+access their elements; but if an array is small and its elements are only
+ever accessed using constant indexes, its address doesn't escape and it's not
+needed: the array can be replaced with a scalar variable for each element,
+and these variables can be promoted
+
+For example:
+    VAR a : int[2];
+    a[0] = 1;
+    a[1] = 2;
+    print a[0] + a[1]
+
+Becomes:
+    VAR a__0, a__1 : int;
+    a__0 = 1;
+    a__1 = 2;
+    print a__0 + a__1
+
+The address of an array escapes if the array is used without an index (passed
+to a function, assigned or printed as a whole, ...), with a non constant
+index, or if the array is accessed by a nested procedure
+"""
+
+from itertools import product
+
+from frontend.ast import Var, AssignStat, ArrayElement, CallStat, Const
+from ir.function_tree import FunctionTree
+from ir.ir import ArrayType, Symbol
+from logger import green, magenta
+
+
+MAX_ELEMENTS_TO_SCALARIZE = 8
+
+
+# Only small arrays of register sized elements, defined in a function and
+# not used in nested procedures, are worth scalarizing
+def can_be_scalarized(symbol, function_symbol):
+    if not isinstance(symbol.type, ArrayType) or symbol.function_symbol != function_symbol:
+        return False
+
+    if symbol.alloc_class not in ['auto', 'global'] or symbol.used_in_nested_procedure:
+        return False
+
+    if not symbol.type.basetype.register_promotable:
+        return False
+
+    elements = 1
+    for dim in symbol.type.dims:
+        elements *= dim
+
+    return elements <= MAX_ELEMENTS_TO_SCALARIZE
+
+
+# Returns the indexes of the element accessed by this ArrayElement, or None
+# if they are not all constant or the access is not to a single element
+def get_constant_indexes(array_element):
+    dims = array_element.symbol.type.dims
+    if len(array_element.children) != len(dims):
+        return None
+
+    indexes = []
+    for i in range(len(dims)):
+        index = array_element.children[i]
+        if type(index) is not Const or index.symbol is not None:
+            return None
+        if type(index.value) is not int or not (0 <= index.value < dims[i]):
+            return None
+        indexes.append(index.value)
+
+    return tuple(indexes)
+
+
+# Returns True if the address of the array is needed by this node
+def escapes(node):
+    if type(node) is ArrayElement:
+        return get_constant_indexes(node) is None
+
+    if type(node) is Var or type(node) is AssignStat:
+        return node.offset is None
+
+    return True
+
+
+# The name of the scalar that replaces an element, which must also be a valid
+# assembler label, since global variables are referenced by name
+def get_element_name(array, indexes):
+    return f"{array.name}__" + "_".join([str(index) for index in indexes])
+
+
+def perform_array_scalarization(program, debug_info):
+    debug_info['array_scalarization'] = []
+
+    candidates = {}  # used as an ordered set
+    names = set()
+    for function_node in FunctionTree.get_function_nodes():
+        for symbol in function_node.definition.body.local_symtab:
+            names.add(symbol.name)
+            if can_be_scalarized(symbol, function_node.symbol):
+                candidates[symbol] = None
+
+    # the name of an element can't clash with the one of an existing symbol
+    for array in list(candidates):
+        if any([get_element_name(array, indexes) in names for indexes in product(*[range(dim) for dim in array.type.dims])]):
+            del candidates[array]
+
+    # find all the nodes that reference the candidates
+    references = []
+
+    def find_references(node):
+        if getattr(node, 'symbol', None) in candidates:
+            references.append(node)
+
+        # the returns of a call are not navigated
+        if type(node) is CallStat:
+            for ret in node.returns:
+                if ret != "_" and ret.symbol in candidates:
+                    references.append(ret)
+                    if ret.offset is not None:
+                        references.append(ret.offset)
+
+    FunctionTree.navigate(find_references, quiet=True)
+
+    for node in references:
+        if node.symbol in candidates and escapes(node):
+            del candidates[node.symbol]
+
+    if len(candidates) == 0:
+        return
+
+    # create a scalar symbol for each element of the arrays
+    elements = {}
+    for array in candidates:
+        for indexes in product(*[range(dim) for dim in array.type.dims]):
+            elements[(array, indexes)] = Symbol(get_element_name(array, indexes), array.type.basetype, alloc_class=array.alloc_class, function_symbol=array.function_symbol)
+
+    # access the scalars instead of the array elements
+    for node in references:
+        if type(node) is not ArrayElement and node.symbol in candidates:
+            node.symbol = elements[(node.symbol, get_constant_indexes(node.offset))]
+            node.offset = None
+
+    # replace the arrays with their elements in every SymbolTable
+    for function_node in FunctionTree.get_function_nodes():
+        symtab = function_node.definition.body.local_symtab
+        new_symbols = []
+        for symbol in symtab:
+            if symbol in candidates:
+                new_symbols += [element for key, element in elements.items() if key[0] == symbol]
+            else:
+                new_symbols.append(symbol)
+        symtab[:] = new_symbols
+
+    for array in candidates:
+        print(green(f"Scalarized array {magenta(f'{array.name}')}\n"))
+        debug_info['array_scalarization'] += [array]
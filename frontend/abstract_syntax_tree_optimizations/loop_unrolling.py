@@ -43,7 +43,6 @@ For now, the LOOP_UNROLLING_FACTOR can only be a power of 2
 """
 
 from copy import deepcopy
-from math import log
 
 from frontend.ast import ForStat, Const, BinaryExpr, UnaryExpr, IfStat, AssignStat, Var, StatList, ReturnStat
 from ir.function_tree import FunctionTree
@@ -52,6 +51,10 @@ from logger import red, green, yellow, magenta, cyan
 
 LOOP_UNROLLING_FACTOR = 2
 
+# checked once, when the module is loaded
+if LOOP_UNROLLING_FACTOR < 1 or LOOP_UNROLLING_FACTOR & (LOOP_UNROLLING_FACTOR - 1) != 0:
+    raise RuntimeError("Loop Unrolling factor must be a power of 2")
+
 
 def unroll(self, debug_info):
     if not check_if_for_loop_is_normalized(self):
@@ -121,17 +124,17 @@ ForStat.unroll = unroll
 
 
 def loop_unrolling(node, debug_info):
+    unroll = getattr(type(node), 'unroll', None)
+    if unroll is None:
+        return
+
     try:
-        node.unroll(debug_info)
+        unroll(node, debug_info)
     except AttributeError as e:
-        if e.name != "unroll":
-            raise RuntimeError(f"Raised AttributeError {e}")
+        raise RuntimeError(f"Raised AttributeError {e}")
 
 
 def perform_loop_unrolling(program, debug_info):
-    if not log(LOOP_UNROLLING_FACTOR, 2).is_integer():
-        raise RuntimeError("Loop Unrolling factor must be a power of 2")
-
     if LOOP_UNROLLING_FACTOR < 2:
         print(red(f"Skipping Loop Unrolling because the LOOP_UNROLLING_FACTOR is {LOOP_UNROLLING_FACTOR}"))
         return
@@ -11,7 +11,6 @@ from copy import deepcopy
 from frontend.ast import CallStat, AssignStat, StaticArray, Var, Const, PrintStat, ArrayElement, String
 from ir.function_tree import FunctionTree
 from ir.ir import PointerType, TYPENAMES, new_temporary
-from ir.support import get_node_list
 
 
 # Add AssignStats for each (non-dontcare) return symbol of the CallStat;
@@ -40,11 +39,9 @@ def add_return_assignments(self):
         assign_stat = AssignStat(parent=self.parent, symbol=self.returns[i].symbol, offset=self.returns[i].offset, expr=temp, symtab=self.symtab)
         assign_stats.append(assign_stat)
 
-    # add the assign statements after the call
+    # add the assign statements after the call, all at once
     index = self.parent.children.index(self)
-    for assign_stat in assign_stats:
-        self.parent.children.insert(index + 1, assign_stat)
-        index += 1
+    self.parent.children[index + 1:index + 1] = assign_stats
 
     # these temporaries are the ones that will contain the return values
     self.returns_storage = [x.expr for x in assign_stats]
@@ -154,25 +151,35 @@ def array_print(self):
 PrintStat.expand = array_print
 
 
+# Expand each node once; most nodes can't be expanded, so check for the
+# method instead of catching the AttributeError of the missing expand;
+# returns True if the node has been expanded
 def node_expansion(node):
+    if getattr(node, 'expanded', False):
+        return False
+    node.expanded = True
+
+    expand = getattr(type(node), 'expand', None)
+    if expand is None:
+        return False
+
     try:
-        if node.expanded:
-            return
-    except AttributeError:
-        try:
-            node.expanded = True
-            node.expand()
-        except AttributeError as e:
-            if e.name != "expand":
-                raise RuntimeError(f"Raised AttributeError {e}")
-
-
-# Try to expand the program until everything has been expanded
+        expand(node)
+    except AttributeError as e:
+        raise RuntimeError(f"Raised AttributeError {e}")
+    return True
+
+
+# Try to expand the program until no more nodes get expanded (expansions
+# can add new nodes that need to be expanded)
 def perform_node_expansion(program):
-    program_size = len(get_node_list(program, quiet=True))
-    old_program_size = 0
-    while old_program_size < program_size:
-        FunctionTree.navigate(node_expansion, quiet=True)
+    expanded = True
+
+    def expand_nodes(node):
+        nonlocal expanded
+        if node_expansion(node):
+            expanded = True
 
-        old_program_size = program_size
-        program_size = len(get_node_list(program, quiet=True))
+    while expanded:
+        expanded = False
+        FunctionTree.navigate(expand_nodes, quiet=True)
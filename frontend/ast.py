@@ -27,6 +27,14 @@ BINARY_CONDITIONALS = ['eql', 'neq', 'lss', 'leq', 'gtr', 'geq']
 UNARY_BOOLEANS = ['not']
 BINARY_BOOLEANS = ['and', 'or']
 
+# the attributes that can contain other nodes, in the order in which they are
+# navigated; checking them one by one with hasattr is a lot cheaper than
+# listing all the attributes of each node with dir
+NODE_ATTRIBUTES = ('defs', 'body', 'cond', 'value', 'thenpart', 'elifspart', 'elsepart', 'symbol', 'call', 'init', 'step', 'expr', 'target', 'global_symtab', 'local_symtab', 'offset', 'epilogue')
+
+# the attributes shown when printing a node
+PRINTED_ATTRIBUTES = ('body', 'cond', 'value', 'thenpart', 'elifspart', 'elsepart', 'symbol', 'call', 'init', 'step', 'expr', 'target', 'defs', 'local_symtab', 'offset', 'function_symbol', 'parameters', 'returns', 'called_by_counter', 'epilogue', 'values', 'type', 'operator')
+
 
 # Returns a CastInstruction from operand to type; if type is None,
 # this is an autocast
@@ -61,10 +69,10 @@ class ASTNode:  # abstract
 
     # XXX: must only be used for printing
     def type_repr(self):
-        return ".".join(str(type(self)).split("'")[1].split(".")[-2:])
+        return ir.get_type_name(type(self))
 
     def __repr__(self):
-        attrs = {'body', 'cond', 'value', 'thenpart', 'elifspart', 'elsepart', 'symbol', 'call', 'init', 'step', 'expr', 'target', 'defs', 'local_symtab', 'offset', 'function_symbol', 'parameters', 'returns', 'called_by_counter', 'epilogue', 'values', 'type', 'operator'} & set(dir(self))
+        attrs = [x for x in PRINTED_ATTRIBUTES if hasattr(self, x)]
 
         res = f"{cyan(f'{self.type_repr()}')}, {id(self)}" + " {"
         if self.parent is not None:
@@ -73,7 +81,7 @@ class ASTNode:  # abstract
 
         res = f"{res}"
 
-        if "children" in dir(self) and len(self.children):
+        if hasattr(self, 'children') and len(self.children):
             res += ii("children: {\n")
             for child in self.children:
                 rep = repr(child).split("\n")
@@ -95,30 +103,28 @@ class ASTNode:  # abstract
         return res
 
     def navigate(self, action, *args, quiet=False):
-        attrs = ['defs', 'body', 'cond', 'value', 'thenpart', 'elifspart', 'elsepart', 'symbol', 'call', 'init', 'step', 'expr', 'target', 'global_symtab', 'local_symtab', 'offset', 'epilogue']
-        attrs = [x for x in attrs if x in set(dir(self))]
+        attrs = [x for x in NODE_ATTRIBUTES if hasattr(self, x)]
 
-        if 'children' in dir(self) and len(self.children):
+        if hasattr(self, 'children') and len(self.children):
             if not quiet:
                 log_indentation(f"Navigating to {cyan(len(self.children))} children of {cyan(self.type_repr())}, {id(self)}")
             for node in self.children:
-                try:
-                    logger.indentation += 1
-                    node.navigate(action, *args)
-                    logger.indentation -= 1
-                except AttributeError:
-                    logger.indentation -= 1
-
-        for attr in attrs:
-            try:
-                if not quiet:
-                    log_indentation(f"Navigating to attribute {cyan(attr)} of {cyan(self.type_repr())}, {id(self)}")
+                # symbols, types and values can't be navigated
+                if getattr(type(node), 'navigate', None) is None:
+                    continue
                 logger.indentation += 1
-                node = getattr(self, attr)
-                node.navigate(action, *args)
-                logger.indentation -= 1
-            except AttributeError:
+                node.navigate(action, *args, quiet=quiet)
                 logger.indentation -= 1
+
+        for attr in attrs:
+            node = getattr(self, attr)
+            if getattr(type(node), 'navigate', None) is None:
+                continue
+            if not quiet:
+                log_indentation(f"Navigating to attribute {cyan(attr)} of {cyan(self.type_repr())}, {id(self)}")
+            logger.indentation += 1
+            node.navigate(action, *args, quiet=quiet)
+            logger.indentation -= 1
         if not quiet:
             log_indentation(f"Navigating to {cyan(self.type_repr())}, {id(self)}")
 
@@ -126,10 +132,10 @@ class ASTNode:  # abstract
 
     def replace(self, old, new):
         new.parent = self
-        if 'children' in dir(self) and len(self.children) and old in self.children:
+        if hasattr(self, 'children') and len(self.children) and old in self.children:
             self.children[self.children.index(old)] = new
             return True
-        attrs = {'body', 'cond', 'value', 'thenpart', 'elifspart', 'elsepart', 'symbol', 'call', 'init', 'step', 'expr', 'target', 'defs', 'global_symtab', 'local_symtab', 'offset', 'epilogue'} & set(dir(self))
+        attrs = [x for x in NODE_ATTRIBUTES if hasattr(self, x)]
 
         for d in attrs:
             try:
@@ -828,9 +834,7 @@ class ReturnStat(Stat):
             cast = cast_numeric_to_type(returns[index], self.symtab, type=type)
 
             if cast.source in returns:  # the actual return destination is the cast
-                ind = returns.index(cast.source)
-                returns.remove(cast.source)
-                returns.insert(ind, cast.dest)
+                returns[returns.index(cast.source)] = cast.dest
 
             casts += [cast]
 
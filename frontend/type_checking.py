@@ -348,14 +348,16 @@ FunctionDef.type_checking = functiondef_type_checking
 
 
 def type_checking(node):
+    check = getattr(type(node), 'type_checking', None)
+    if check is None:
+        log_indentation(underline(f"Type checking not yet implemented for type {node.type_repr()}"))
+        return
+
     try:
-        node.type_checking()
-        log_indentation(green(f"Type checked {node.type_repr()}, {id(node)}: {node.type}"))
+        check(node)
     except AttributeError as e:
-        if e.name == "type_checking":
-            log_indentation(underline(f"Type checking not yet implemented for type {node.type_repr()}"))
-        else:
-            raise RuntimeError(e)
+        raise RuntimeError(e)
+    log_indentation(green(f"Type checked {node.type_repr()}, {id(node)}: {node.type}"))
 
 
 def perform_type_checking(program):
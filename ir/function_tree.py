@@ -18,14 +18,18 @@ class FunctionNode:
         self.siblings = []
         self.definition = definition
 
-    def __repr__(self):
-        res = f"{cyan('|')} {magenta(f'{self.symbol.name}')}\n"
+    # Each function is a line, indented by its depth in the tree; the lines are
+    # collected in a single visit, instead of indenting again the repr of each
+    # subtree at every level
+    def repr_lines(self, lines, depth=0):
+        lines.append(f"{' ' * 4 * depth}{cyan('|')} {magenta(f'{self.symbol.name}')}\n")
         for function in self.children:
-            rep = repr(function).split("\n")[:-1]
-            res += "\n".join([f"{' ' * 4}{s}" for s in rep])
-            res += "\n"
+            function.repr_lines(lines, depth + 1)
+
+        return lines
 
-        return res
+    def __repr__(self):
+        return "".join(self.repr_lines([]))
 
     def is_parent_of(self, function):
         return function in self.children
@@ -64,14 +68,18 @@ def get_distance_between_functions(function1, function2):
 # Static class used to create and access the Function Tree
 class FunctionTree:
     root = FunctionNode(None, [])
+    # index of all the FunctionNodes by their symbol, rebuilt with the tree
+    function_nodes = {}
 
     @staticmethod
     def populate_function_tree(program, symbol):
+        FunctionTree.function_nodes = {}
         FunctionTree.root = FunctionTree.create_function_tree(program, symbol)
 
     @staticmethod
     def create_function_tree(root, symbol):
         function_tree = FunctionNode(symbol, [], definition=root)
+        FunctionTree.function_nodes[symbol] = function_tree
         for function in root.body.defs.children:
             new_node = FunctionTree.create_function_tree(function, function.symbol)
             function_tree.children.append(new_node)
@@ -82,29 +90,31 @@ class FunctionTree:
     # returns the FunctionNode with the wanted symbol
     @staticmethod
     def get_function_node(symbol):
-        return FunctionTree.__get_function_node(FunctionTree.root, symbol)
-
-    @staticmethod
-    def __get_function_node(function_node, symbol):
-        if function_node.symbol == symbol:
-            return function_node
-
-        for child in function_node.children:
-            x = FunctionTree.__get_function_node(child, symbol)
-            if x is not None:
-                return x
-
-        return None
+        return FunctionTree.function_nodes.get(symbol)
 
     @staticmethod
     # returns the FuncDef with the symbol specified, if it's reachable
     # raises a RuntimeError if it doesn't find it
     def get_function_definition(target_function_symbol):
-        function_definition = FunctionTree.get_function_node(target_function_symbol).definition
-        if function_definition is None:
+        function_node = FunctionTree.get_function_node(target_function_symbol)
+        if function_node is None or function_node.definition is None:
             raise RuntimeError(f"Can't find function {target_function_symbol.name}")
 
-        return function_definition
+        return function_node.definition
+
+    # returns all the FunctionNodes in a flat list, in the same order in which
+    # navigate visits them (nested functions before their parent)
+    @staticmethod
+    def get_function_nodes():
+        function_nodes = []
+        FunctionTree.__get_function_nodes(FunctionTree.root, function_nodes)
+        return function_nodes
+
+    @staticmethod
+    def __get_function_nodes(root, function_nodes):
+        for child in root.children:
+            FunctionTree.__get_function_nodes(child, function_nodes)
+        function_nodes.append(root)
 
     @staticmethod
     def navigate(action, *args, quiet=False):
@@ -125,7 +135,7 @@ class FunctionTree:
         logger.indentation += 1
 
         for child in body.children:
-            if 'navigate' in dir(child):
+            if hasattr(child, 'navigate'):
                 if not quiet:
                     log_indentation(f"Navigating to child {cyan(child.type_repr())} of {cyan(body.type_repr())}, {id(body)}")
                 logger.indentation += 1
@@ -6,6 +6,8 @@ lowering, on IR instructions"""
 from ir.function_tree import FunctionTree
 from ir.intermediate_representation_optimizations.memory_to_register_promotion import memory_to_register_promotion
 from ir.intermediate_representation_optimizations.function_inlining import function_inlining
+from ir.intermediate_representation_optimizations.redundant_load_elimination import redundant_load_elimination
+from ir.intermediate_representation_optimizations.dead_store_elimination import dead_store_elimination
 from logger import h3
 
 
@@ -18,4 +20,17 @@ def perform_intermediate_representation_optimizations(program, optimization_leve
     if optimization_level > 1:
         print(h3("FUNCTION INLINING"))
         debug_info['function_inlining'] = []
-        FunctionTree.navigate(function_inlining, debug_info, quiet=True)
+        # only function bodies can contain calls, there's no need to navigate
+        # through all their instructions
+        for function_node in FunctionTree.get_function_nodes():
+            function_inlining(function_node.definition.body.body, debug_info)
+
+        print(h3("REDUNDANT LOAD ELIMINATION"))
+        debug_info['redundant_load_elimination'] = []
+        for function_node in FunctionTree.get_function_nodes():
+            redundant_load_elimination(function_node.definition, debug_info)
+
+        print(h3("DEAD STORE ELIMINATION"))
+        debug_info['dead_store_elimination'] = []
+        for function_node in FunctionTree.get_function_nodes():
+            dead_store_elimination(function_node.definition, debug_info)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+"""A store to a variable is useless if the same variable is stored again
+before anything can read it (inlining creates some of these, when storing
+returned values). Inside a block of instructions without labels or branches,
+remove the first store
+
+For example:
+    [a] <- t1
+    [a] <- t2
+
+Becomes:
+    [a] <- t2
+"""
+
+from ir.ir import BranchInstruction, StoreInstruction, LabelInstruction
+from logger import green
+
+
+# Only scalars in memory can be tracked, everything else could be
+# accessed through a pointer
+def is_memory_scalar(symbol):
+    return symbol.alloc_class in ['auto', 'global', 'param'] and symbol.is_scalar()
+
+
+def dead_store_elimination(function_definition, debug_info):
+    instructions = function_definition.body.body.children
+    pending_stores = {}  # memory symbol -> index of the last store, not read yet
+    removed = set()
+
+    for i in range(len(instructions)):
+        instruction = instructions[i]
+        instruction_type = type(instruction)
+
+        # a new block begins, or a called function can read any variable
+        if instruction_type is LabelInstruction or instruction_type is BranchInstruction:
+            pending_stores.clear()
+            continue
+
+        for used in instruction.used_variables():
+            pending_stores.pop(used, None)
+
+        if instruction_type is StoreInstruction and is_memory_scalar(instruction.dest):
+            if instruction.dest in pending_stores:
+                useless = instructions[pending_stores[instruction.dest]]
+                removed.add(pending_stores[instruction.dest])
+                print(f"{green('Removed useless store')} {useless}")
+                debug_info['dead_store_elimination'] += [useless]
+            pending_stores[instruction.dest] = i
+
+    if len(removed) > 0:
+        instructions[:] = [instructions[i] for i in range(len(instructions)) if i not in removed]
@@ -3,76 +3,70 @@
 """It's faster to directly execute function code instead of jumping to one:
 when possible, directly replace the function call with its code"""
 
-from copy import deepcopy
-
 from ir.function_tree import FunctionTree
-from ir.ir import BranchInstruction, StoreInstruction, LoadInstruction, LabelInstruction, TYPENAMES
+from ir.ir import IRInstruction, BranchInstruction, StoreInstruction, LoadInstruction, LabelInstruction, InstructionList, TYPENAMES
 from logger import green, magenta
 
 
 MAX_INSTRUCTION_TO_INLINE = 16
+# leaf functions are self-contained, so a bigger body is still worth inlining
+MAX_LEAF_INSTRUCTION_TO_INLINE = 40
+# functions called only once don't make the code grow when inlined
+MAX_SINGLE_CALL_INSTRUCTION_TO_INLINE = 150
 
 
-# Replace all the temporaries in all the instructions with equivalent ones
-def replace_temporaries(instructions):
-    mapping = {}  # keep track of already remapped temporaries
-    for instruction in instructions:
-        instruction.replace_temporaries(mapping, create_new=True)
+# Returns True if a function nested in this one, at any depth, is still called
+def calls_nested_functions(function_definition):
+    for nested_definition in function_definition.body.defs.children:
+        if nested_definition.called_by_counter > 0 or calls_nested_functions(nested_definition):
+            return True
 
-    return instructions
+    return False
 
 
-# Remove all the return instructions and if it's needed, add a branch to
-# an exit label to simulate a return
-def remove_returns(instructions, returns):
-    exit_label = TYPENAMES['label']()
-    exit_instr = LabelInstruction(instructions[0].parent, label=exit_label, symtab=instructions[0].symtab)
-    exit_instr.marked_for_removal = False
-    no_exit_label = True  # decides whether or not to put the label at the end
+# A function can be inlined as a whole only if its nested functions are not
+# called anymore (the calls of an inlined nested function are now in its
+# parent); only the loads of parameters get remapped when inlining, so the
+# addresses of array parameters must not be taken either, and the local
+# variables must live in registers, or their stack slot would be shared
+# between all the functions they get inlined into
+def is_self_contained(function_definition):
+    if calls_nested_functions(function_definition):
+        return False
 
-    for i in range(len(instructions)):
-        instruction = instructions[i]
-        instruction.marked_for_removal = False
+    for parameter in function_definition.parameters:
+        if parameter.is_array():
+            return False
 
-        if isinstance(instruction, BranchInstruction) and instruction.is_return():
-            instruction.marked_for_removal = True
+    for local_symbol in function_definition.body.local_symtab:
+        if local_symbol.alloc_class == 'auto' and local_symbol.type.size > 0:
+            return False
 
-            if i < len(instructions) - 1:  # if this isn't the last istruction, add a jump to an exit label
-                no_exit_label = False
-                instructions[i] = BranchInstruction(target=exit_label, symtab=instruction.symtab)
-                instructions[i].marked_for_removal = False
+    return True
 
-    if not no_exit_label:
-        instructions.append(exit_instr)
 
-    instructions = list(filter(lambda x: not x.marked_for_removal, instructions))
-    return instructions
+# A leaf function is self-contained and doesn't call other functions
+def is_leaf(function_definition):
+    if not is_self_contained(function_definition):
+        return False
 
+    for instruction in function_definition.body.body.children:
+        if type(instruction) is BranchInstruction and instruction.is_call():
+            return False
 
-# Whenever there's a return, add before the StoreInstructions that put the value
-# returned by the inlined function into the symbol used by the inliner function
-def add_returns_stores(instructions, returns):
-    stores_indices = []
+    return True
 
-    for i in range(len(instructions)):
-        instruction = instructions[i]
-        instruction.marked_for_removal = False
 
-        if isinstance(instruction, BranchInstruction) and instruction.is_return():
-            new_stores = []
-            for j in range(len(returns)):
-                if returns[j] != "_":  # skip dontcares
-                    new_store = StoreInstruction(parent=instruction.parent, source=instruction.returns[j], dest=returns[j], symtab=instruction.symtab)
-                    new_stores.append(new_store)
-            stores_indices.append((i, new_stores))
+# Returns True if the body of the function is small enough to be inlined
+def is_small_enough(function_definition):
+    size = len(function_definition.body.body.children)
+    if size < MAX_INSTRUCTION_TO_INLINE:
+        return True
 
-    for stores_index in reversed(stores_indices):  # reversed order otherwise the indices get mixed
-        i = stores_index[0]  # index in the instruction list
-        for store in stores_index[1]:
-            instructions.insert(i, store)
-            i += 1
+    if size < MAX_SINGLE_CALL_INSTRUCTION_TO_INLINE and function_definition.called_by_counter == 1 and is_self_contained(function_definition):
+        return True
 
-    return instructions
+    return size < MAX_LEAF_INSTRUCTION_TO_INLINE and is_leaf(function_definition)
 
 
 # Map the symbols used in the functions with the ones used in the call
@@ -85,81 +79,162 @@ def map_symbols(function_symbols, call_symbols):
     return destinations
 
 
-# Change all LoadInstruction symbols from variables to temporaries using the provided mapping
-def change_loads(instructions, destinations):
-    for instruction in instructions:
-        if isinstance(instruction, LoadInstruction) and instruction.source in destinations:
+# Rewrite the instructions of the inlined function in a single pass:
+#   - replace all the temporaries with equivalent ones
+#   - change all LoadInstruction symbols from parameters to the symbols
+#     used in the call, using the provided mapping
+#   - whenever there's a return, add before it the StoreInstructions that put
+#     the value returned by the inlined function into the symbol used by the
+#     inliner function
+#   - remove all the return instructions and if it's needed, add a branch to
+#     an exit label to simulate a return
+#   - drop the instructions between an unconditional branch and the next
+#     label, since they can't be reached
+def rewrite_instructions(instructions, destinations, returns):
+    mapping = {}  # keep track of already remapped temporaries
+    new_instructions = []
+    exit_branches = []  # their target is set when the exit label is created
+    last = len(instructions) - 1
+    reachable = True
+
+    for i in range(len(instructions)):
+        instruction = instructions[i]
+        instruction_type = type(instruction)
+
+        if instruction_type is LabelInstruction:
+            reachable = True
+        elif not reachable:
+            continue
+
+        instruction.replace_temporaries(mapping, create_new=True)
+
+        if instruction_type is LoadInstruction and instruction.source in destinations:
             if instruction.source.is_array() and destinations[instruction.source].is_pointer():
                 # fix pass-by-reference, instead this becomes a move of the array address
                 destinations[instruction.source].type = instruction.source.type
             instruction.source = destinations[instruction.source]
 
-    return instructions
+        elif instruction_type is BranchInstruction and instruction.is_return():
+            for j in range(len(returns)):
+                if returns[j] != "_":  # skip dontcares
+                    new_store = StoreInstruction(parent=instruction.parent, source=instruction.returns[j], dest=returns[j], symtab=instruction.symtab)
+                    new_instructions.append(new_store)
+
+            if i < last:  # if this isn't the last istruction, add a jump to an exit label
+                exit_branch = BranchInstruction(symtab=instruction.symtab)
+                exit_branches.append(exit_branch)
+                new_instructions.append(exit_branch)
+            reachable = False
+            continue
+
+        elif instruction_type is BranchInstruction and instruction.is_unconditional() and not instruction.is_call():
+            reachable = False
+
+        new_instructions.append(instruction)
+
+    # the exit label is only created if it's needed
+    if len(exit_branches) > 0:
+        exit_label = TYPENAMES['label']()
+        for exit_branch in exit_branches:
+            exit_branch.target = exit_label
+        new_instructions.append(LabelInstruction(instructions[0].parent, label=exit_label, symtab=instructions[0].symtab))
+
+    return new_instructions
 
 
 # If this call-BranchInstruction can be inlined, get all the instructions of the function,
-# apply transformations to them (substituting returns with branches to exit, ...),
-# get all the instructions before and after the call, apply transformations to them
-# (change store of parameters to store in registers, ...), then put everything together
-def inline(self, debug_info):
+# apply transformations to them (substituting returns with branches to exit, change
+# store of parameters to store in registers, ...) and return them, so that they can
+# replace the call; returns None if the call can't be inlined
+#
+# rejected_targets maps the functions that can't be inlined in the current
+# function to the reason why, so that it's computed only once per function;
+# local_symbols contains the symbols of the current function, so that the
+# symbol table doesn't need to be scanned again for each inlined call
+def inline(self, debug_info, rejected_targets, local_symbols):
     if not self.is_call():
         return
 
+    if self.target in rejected_targets:
+        debug_info['function_inlining'] += [rejected_targets[self.target]]
+        return
+
     target_definition = FunctionTree.get_function_definition(self.target)
-    if len(target_definition.body.body.children) >= MAX_INSTRUCTION_TO_INLINE:
-        debug_info['function_inlining'] += [(deepcopy(target_definition), "Too many instructions")]
+    if not is_small_enough(target_definition):
+        rejected_targets[self.target] = (target_definition.clone(), "Too many instructions")
+        debug_info['function_inlining'] += [rejected_targets[self.target]]
         return
 
     # avoid inlining recursive functions
     if self.target == self.get_function().symbol:
-        debug_info['function_inlining'] += [(deepcopy(target_definition), "Recursive function")]
+        rejected_targets[self.target] = (target_definition.clone(), "Recursive function")
+        debug_info['function_inlining'] += [rejected_targets[self.target]]
         return
 
-    target_definition_copy = deepcopy(target_definition)
+    target_definition_copy = target_definition.clone()
     target_definition_copy.symbol = self.get_function().symbol
 
-    # split the current function in before:body-of-the-function-to-inline:after
-    index = self.parent.children.index(self)
-    previous_instructions = self.parent.children[:index]
     function_instructions = target_definition_copy.body.body.children
-    next_instructions = self.parent.children[index + 1:]
-
-    function_instructions = replace_temporaries(function_instructions)
 
-    # change parameters stores and loads into movs between registers
+    # change parameters loads into movs between registers, and add
+    # instructions to store return variables in the correct registers
     parameters_destinations = map_symbols(target_definition_copy.parameters, self.parameters)
-    function_instructions = change_loads(function_instructions, parameters_destinations)
-
-    # add instructions to store return variables in the correct registers
-    function_instructions = add_returns_stores(function_instructions, self.returns)
-    function_instructions = remove_returns(function_instructions, target_definition_copy.returns)
-
-    # recompact everything
-    self.parent.children = previous_instructions + function_instructions + next_instructions
+    function_instructions = rewrite_instructions(function_instructions, parameters_destinations, self.returns)
 
+    # collect the new local symbols and add them all at once; we don't need
+    # the function parameters, they have been mapped to other symbols
+    parameters = set(target_definition.parameters)
+    new_symbols = []
     for local_symbol in target_definition.body.local_symtab:
-        if local_symbol in target_definition.parameters:
-            continue  # we don't need the function parameters, they have been mapped to other symbols
-
-        elif local_symbol not in self.parent.parent.local_symtab:
-            self.parent.parent.local_symtab.append(local_symbol)
-
-    for child in self.parent.children:
-        child.parent = self.parent
+        if local_symbol not in local_symbols and local_symbol not in parameters:
+            local_symbols.add(local_symbol)
+            new_symbols.append(local_symbol)
+    self.parent.parent.local_symtab.extend(new_symbols)
 
     # reference counting: if no one is calling the inlined function, it can be removed
     target_definition.called_by_counter -= 1
 
     print(green(f"Inlining function {magenta(f'{self.target.name}')} {green('inside function')} {magenta(f'{self.get_function().symbol.name}')}\n"))
-    debug_info['function_inlining'] += [(deepcopy(target_definition), self.get_function().symbol)]
+    debug_info['function_inlining'] += [(target_definition.clone(), self.get_function().symbol)]
+
+    return function_instructions
+
+
+# Replace all the calls of this InstructionList that can be inlined with the
+# instructions of the called function; the new list of instructions is built
+# in a single pass, instead of splitting and joining the list at each call
+def inline_calls(self, debug_info):
+    instructions = []
+    # the bodies of the called functions don't change while this one is
+    # being rebuilt, so a function that can't be inlined is rejected once
+    rejected_targets = {}
+    local_symbols = set(self.parent.local_symtab)
+
+    for instruction in self.children:
+        inlined_instructions = None
+        if type(instruction) is BranchInstruction:
+            inlined_instructions = inline(instruction, debug_info, rejected_targets, local_symbols)
+
+        if inlined_instructions is None:
+            instructions.append(instruction)
+        else:
+            # only the inlined instructions have a different parent
+            for inlined_instruction in inlined_instructions:
+                inlined_instruction.parent = self
+            instructions += inlined_instructions
+
+    self.children = instructions
+
+
+# Only InstructionLists can contain calls to inline: every other node gets
+# this no-op, so that navigating doesn't need to catch an AttributeError
+def skip_inline(self, debug_info):
+    pass
 
 
-BranchInstruction.inline = inline
+IRInstruction.inline = skip_inline
+InstructionList.inline = inline_calls
 
 
 def function_inlining(node, debug_info):
-    try:
-        node.inline(debug_info)
-    except AttributeError as e:
-        if e.name != "inline":
-            raise RuntimeError(f"Raised AttributeError {e}")
+    node.inline(debug_info)
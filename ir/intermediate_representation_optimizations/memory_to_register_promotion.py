@@ -5,57 +5,80 @@ variables in registers instead of the stack"""
 
 from copy import deepcopy
 
-from backend.codegenhelp import REGISTER_SIZE
+from ir.ir import ArrayType, PointerType
 from logger import red, green, blue
+import logger
 
+# symbols of these types need their address to be accessible
+NON_PROMOTABLE_TYPES = (ArrayType, PointerType)
 
-# Remove the symbol from the symbol table and convert it to a register
-def promote_symbol(symbol, root):
-    root.body.symtab.remove(symbol)
-    symbol.alloc_class = 'reg'
+
+# Remove the symbols from the symbol table and convert them to registers;
+# the symbol table is compacted in place with a single pass
+def promote_symbols(symbols, root):
+    promoted = set(symbols)
+    symtab = root.body.symtab
+    symtab[:] = [symbol for symbol in symtab if symbol not in promoted]
+
+    for symbol in symbols:
+        symbol.alloc_class = 'reg'
 
 
 # A variable can be promoted from being stored in memory to being stored in a register if
 #   - the variable is not used in any nested procedure
 #   - the variable address is needed for something (example -> ArrayType, PointerType)
 #   - the symbol type is not the same size as the registers
-def memory_to_register_promotion(root, debug_info):
-    to_promote = []
+#
+# Most symbols can't be promoted: the reason is only looked for when the log
+# is enabled
+def can_be_promoted(symbol):
+    symbol_type = symbol.type
+    if symbol_type.size <= 0:
+        return False
+
+    if symbol.alloc_class not in ['auto', 'global']:
+        return False
+
+    # symbols are only checked once, the first time they are found
+    if getattr(symbol, 'checked', False):
+        return False
+    symbol.checked = True
+
+    if symbol_type.register_promotable and not symbol.used_in_nested_procedure:
+        print(f"{blue('SYMBOL:')} {symbol}")
+        print(green("Promoted\n"))
+        return True
 
-    for symbol in root.body.symtab:
-        if symbol.type.size <= 0:
-            continue
+    if not logger.log_enabled:
+        return False
 
-        if symbol.alloc_class not in ['auto', 'global']:
-            continue
+    # the symbol can't be promoted, find out why
+    print(f"{blue('SYMBOL:')} {symbol}")
+    if isinstance(symbol_type, NON_PROMOTABLE_TYPES):
+        print(red("Can't promote because the symbol address needs to be accessible\n"))
+        return False
 
-        try:
-            if symbol.checked:
-                continue
-        except AttributeError:
-            symbol.checked = True
+    if symbol.used_in_nested_procedure:
+        print(red("Can't promote because the symbol is used in a nested procedure\n"))
+        return False
 
-        print(f"{blue('SYMBOL:')} {symbol}")
+    print(red("Can't promote because the symbol is not the same size as the registers\n"))
+    return False
 
-        if symbol.is_array() or symbol.is_pointer():
-            print(red("Can't promote because the symbol address needs to be accessible\n"))
-            continue
 
-        if symbol.used_in_nested_procedure:
-            print(red("Can't promote because the symbol is used in a nested procedure\n"))
-            continue
+# Visit the function definitions in pre-order (parents before their nested
+# functions) using an explicit stack instead of recursion
+def memory_to_register_promotion(root, debug_info):
+    function_definitions = [root]
 
-        if symbol.type.size != REGISTER_SIZE:
-            print(red("Can't promote because the symbol is not the same size as the registers\n"))
-            continue
+    while function_definitions:
+        function_definition = function_definitions.pop()
 
-        print(green("Promoted\n"))
-        to_promote.append(symbol)
+        to_promote = [symbol for symbol in function_definition.body.symtab if can_be_promoted(symbol)]
 
-    for symbol in to_promote:
-        old_symbol = deepcopy(symbol)
-        promote_symbol(symbol, root)
-        debug_info['memory_to_register_promotion'] += [(old_symbol, (deepcopy(symbol)))]
+        old_symbols = [deepcopy(symbol) for symbol in to_promote]
+        promote_symbols(to_promote, function_definition)
+        debug_info['memory_to_register_promotion'] += [(old_symbol, deepcopy(symbol)) for old_symbol, symbol in zip(old_symbols, to_promote)]
 
-    for function_definition in root.body.defs.children:
-        memory_to_register_promotion(function_definition, debug_info)
+        # reversed, so that the first nested function is the first to be popped
+        function_definitions += reversed(function_definition.body.defs.children)
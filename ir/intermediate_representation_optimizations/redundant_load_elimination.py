@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+"""Loading a variable from memory is slow, and often the value is already in
+a register, because the variable has just been stored or loaded (inlining
+creates a lot of these, when storing returned values). Inside a block of
+instructions without labels or branches, replace these loads with moves
+between registers
+
+For example:
+    [a] <- t1
+    t2 <- a
+
+Becomes:
+    [a] <- t1
+    t2 <- t1
+"""
+
+from ir.ir import BranchInstruction, StoreInstruction, LoadInstruction, LabelInstruction
+from logger import green
+
+
+# Only scalars of the same size of the registers are tracked, so that the
+# value in the register is the same one that would be loaded from memory;
+# the variables of other functions are not tracked, the stores to them must
+# never look useless
+def is_tracked(symbol, function_symbol):
+    if symbol.alloc_class not in ['auto', 'global', 'param'] or not symbol.type.register_promotable:
+        return False
+
+    return symbol.function_symbol == function_symbol or symbol.alloc_class == 'global'
+
+
+# Liveness analysis doesn't know which variables are read by the called
+# functions: removing a load could make a store needed by a call look useless
+def has_calls(instructions):
+    for instruction in instructions:
+        if type(instruction) is BranchInstruction and instruction.is_call():
+            return True
+
+    return False
+
+
+# Forget all the values held by the killed symbols, both in memory and in registers
+def kill(values, killed_symbols):
+    for killed in killed_symbols:
+        values.pop(killed, None)
+
+        for symbol in [symbol for symbol in values if values[symbol] == killed]:
+            del values[symbol]
+
+
+def redundant_load_elimination(function_definition, debug_info):
+    instructions = function_definition.body.body.children
+    if has_calls(instructions):
+        return
+
+    function_symbol = function_definition.symbol
+    values = {}  # memory symbol -> register that holds its value
+
+    for i in range(len(instructions)):
+        instruction = instructions[i]
+        instruction_type = type(instruction)
+
+        # a new block begins
+        if instruction_type is LabelInstruction or instruction_type is BranchInstruction:
+            values.clear()
+            continue
+
+        if instruction_type is LoadInstruction and is_tracked(instruction.source, function_symbol):
+            source = instruction.source
+            if source in values:
+                move = StoreInstruction(parent=instruction.parent, source=values[source], dest=instruction.dest, symtab=instruction.symtab)
+                instructions[i] = move
+                print(f"{green('Replaced load')} {instruction} {green('with')} {move}")
+                debug_info['redundant_load_elimination'] += [(instruction, move)]
+                kill(values, [move.dest])
+                continue
+
+            kill(values, [instruction.dest])
+            values[source] = instruction.dest
+            continue
+
+        kill(values, instruction.killed_variables())
+
+        if instruction_type is StoreInstruction and is_tracked(instruction.dest, function_symbol):
+            values[instruction.dest] = instruction.source
@@ -10,9 +10,15 @@ IR instructions (except definitions) need to implement a few methods:
     + replace_temporaries, to replace all their temporary variables with newer
       ones, unless they are already present in the "mapping" dictionary
     + __deepcopy__, specifying a method to copy them and their attributes
+
+IR nodes containing other nodes also override clone, a lightweight copy
+used by the optimizations
+
+All the instructions declare their attributes in __slots__, so they don't
+carry an instance dictionary; only the definitions, which are few, still do
 """
 
-from functools import reduce
+from functools import reduce, cache
 from copy import deepcopy
 
 from backend.codegenhelp import REGISTER_SIZE
@@ -24,6 +30,19 @@ from logger import log_indentation, ii, li, red, green, yellow, blue, magenta, c
 temporary_count = 0
 
 
+# Returns the names of all the slots of a class, including the inherited ones
+@cache
+def get_slots(cls):
+    return tuple(attribute for c in cls.__mro__ for attribute in c.__dict__.get('__slots__', ()))
+
+
+# Returns the printable name of a node class, like "ir.BranchInstruction";
+# it's the same for all the nodes of a class, so it's built only once
+@cache
+def get_type_name(cls):
+    return ".".join(str(cls).split("'")[1].split(".")[-2:])
+
+
 def new_temporary(symtab, type, name=''):
     if name == '':
         global temporary_count
@@ -66,9 +85,19 @@ class Type:
             name = f"u{name}"
         self.name = name
 
+        # a symbol of this type can live in a register: computed once here,
+        # sizes never change and the address of arrays and pointers is needed
+        self.register_promotable = size == REGISTER_SIZE and not isinstance(self, (ArrayType, PointerType))
+
     def __repr__(self):
         return self.name
 
+    # types never change after their creation, so copies can share them; this
+    # also keeps a single LabelType, with a single counter for the label ids
+    def __deepcopy__(self, memo):
+        memo[id(self)] = self
+        return self
+
     def __eq__(self, other):  # strict equivalence
         if not isinstance(other, Type):
             return False
@@ -330,6 +359,8 @@ class DataSymbolTable():
 # IRINSTRUCTION
 
 class IRInstruction():  # abstract
+    __slots__ = ('symtab', 'parent', 'label', 'live_in', 'live_out')
+
     def __init__(self, parent=None, symtab=None):
         self.symtab = symtab
         self.parent = parent
@@ -337,10 +368,10 @@ class IRInstruction():  # abstract
 
     # XXX: must only be used for printing
     def type_repr(self):
-        return ".".join(str(type(self)).split("'")[1].split(".")[-2:])
+        return get_type_name(type(self))
 
     def __repr__(self):
-        attrs = {'body', 'symbol', 'defs', 'local_symtab', 'parameters', 'returns', 'called_by_counter'} & set(dir(self))
+        attrs = [x for x in ('body', 'symbol', 'defs', 'local_symtab', 'parameters', 'returns', 'called_by_counter') if hasattr(self, x)]
 
         res = f"{cyan(f'{self.type_repr()}')}, {id(self)}" + " {"
         if self.parent is not None:
@@ -353,7 +384,7 @@ class IRInstruction():  # abstract
             # node and a node with a missing parent
             res += red(" MISSING PARENT\n")
 
-        if "children" in dir(self) and len(self.children):
+        if hasattr(self, 'children') and len(self.children):
             res += ii("children: {\n")
             for i in range(len(self.children)):
                 rep = repr(self.children[i]).split("\n")
@@ -395,8 +426,22 @@ class IRInstruction():  # abstract
     def killed_variables(self):
         return []
 
+    def clone(self):
+        """Lightweight copy of the node: the new node shares all its attributes
+        with the original one (symbols, types, ...), nodes with children
+        clone them too"""
+        new = type(self).__new__(type(self))
+        for attribute in get_slots(type(self)):
+            if hasattr(self, attribute):
+                setattr(new, attribute, getattr(self, attribute))
+        if hasattr(self, '__dict__'):
+            new.__dict__.update(self.__dict__)
+        return new
+
 
 class BinaryInstruction(IRInstruction):
+    __slots__ = ('operator', 'srca', 'srcb', 'dest')
+
     def __init__(self, parent=None, operator=None, srca=None, srcb=None, dest=None, symtab=None):
         log_indentation(bold(f"New BinaryInstruction Node (id: {id(self)})"))
         super().__init__(parent, symtab)
@@ -429,6 +474,8 @@ class BinaryInstruction(IRInstruction):
 
 
 class UnaryInstruction(IRInstruction):
+    __slots__ = ('operator', 'source', 'dest')
+
     def __init__(self, parent=None, operator=None, source=None, dest=None, symtab=None):
         log_indentation(bold(f"New UnaryInstruction Node (id: {id(self)})"))
         super().__init__(parent, symtab)
@@ -460,6 +507,8 @@ class UnaryInstruction(IRInstruction):
 
 
 class LabelInstruction(IRInstruction):
+    __slots__ = ()
+
     def __init__(self, parent=None, label=None, symtab=None):
         log_indentation(bold(f"New LabelInstruction Node (id: {id(self)})"))
         super().__init__(parent, symtab)
@@ -487,6 +536,8 @@ class LabelInstruction(IRInstruction):
 
 
 class BranchInstruction(IRInstruction):
+    __slots__ = ('cond', 'negcond', 'target', 'parameters', 'returns')
+
     def __init__(self, parent=None, cond=None, target=None, negcond=False, parameters=[], returns=[], symtab=None):
         """cond == None -> branch always taken.
         If negcond is True and Cond != None, the branch is taken when cond is false,
@@ -612,6 +663,8 @@ class BranchInstruction(IRInstruction):
 
 
 class LoadImmInstruction(IRInstruction):
+    __slots__ = ('value', 'dest')
+
     def __init__(self, parent=None, value=0, dest=None, symtab=None):
         log_indentation(bold(f"New LoadImmInstruction Node (id: {id(self)})"))
         super().__init__(parent, symtab)
@@ -640,6 +693,8 @@ class LoadImmInstruction(IRInstruction):
 
 
 class LoadPointerInstruction(IRInstruction):
+    __slots__ = ('source', 'dest')
+
     def __init__(self, parent=None, source=None, dest=None, symtab=None):
         """Loads to the 'dest' symbol the location in memory (as an absolute
         address) of the 'source' symbol. This instruction is used as a starting
@@ -673,6 +728,8 @@ class LoadPointerInstruction(IRInstruction):
 
 
 class LoadInstruction(IRInstruction):
+    __slots__ = ('source', 'dest')
+
     def __init__(self, parent=None, source=None, dest=None, symtab=None):
         """Loads the value in source to dest, which must be a temporary. 'source'
         can be a symbol allocated in memory, or a temporary (symbol allocated to a
@@ -708,6 +765,8 @@ class LoadInstruction(IRInstruction):
 
 
 class StoreInstruction(IRInstruction):
+    __slots__ = ('source', 'dest')
+
     def __init__(self, parent=None, source=None, dest=None, symtab=None):
         """Stores the value in the 'source' temporary (register) to 'dest' which
         can be a symbol allocated in memory, or a temporary (symbol allocated to a
@@ -766,6 +825,9 @@ class CastInstruction(IRInstruction):
     """
     Cast a symbol of type source to one of type dest
     """
+
+    __slots__ = ('source', 'dest')
+
     def __init__(self, parent=None, source=None, dest=None, symtab=None):
         log_indentation(bold(f"New CastInstruction Node (id: {id(self)})"))
         super().__init__(parent, symtab)
@@ -793,6 +855,8 @@ class CastInstruction(IRInstruction):
 
 
 class PrintInstruction(IRInstruction):
+    __slots__ = ('symbol', 'print_type', 'newline')
+
     def __init__(self, parent=None, symbol=None, print_type=None, newline=True, symtab=None):
         log_indentation(bold(f"New PrintInstruction Node (id: {id(self)})"))
         super().__init__(parent, symtab)
@@ -817,6 +881,8 @@ class PrintInstruction(IRInstruction):
 
 
 class ReadInstruction(IRInstruction):
+    __slots__ = ('symbol',)
+
     def __init__(self, parent=None, symbol=None, symtab=None):
         log_indentation(bold(f"New ReadInstruction Node (id: {id(self)})"))
         super().__init__(parent, symtab)
@@ -844,6 +910,8 @@ class ReadInstruction(IRInstruction):
 
 
 class InstructionList(IRInstruction):
+    __slots__ = ('children', 'flat', 'flattened')
+
     def __init__(self, parent=None, children=None, flat=False, symtab=None):
         log_indentation(bold(f"New InstructionList Node (id: {id(self)})"))
         super().__init__(parent, symtab)
@@ -855,6 +923,8 @@ class InstructionList(IRInstruction):
             self.children = []
         # when printing, print line numbers of flattened InstructionLists
         self.flat = flat
+        # the children have been moved to the parent InstructionList
+        self.flattened = False
 
     def used_variables(self):
         u = []
@@ -877,22 +947,31 @@ class InstructionList(IRInstruction):
             raise RuntimeError(f"Can't find instruction '{instruction}' to remove in InstructionList {id(self)}")
 
     def flatten(self):
-        """Remove nested InstructionLists"""
+        """Remove nested InstructionLists: the children of the nested lists
+        are spliced in place of them while the list of children is rebuilt,
+        in a single pass"""
+        children = []
         for child in self.children:
+            if type(child) is InstructionList:
+                # it may have already been flattened by the navigation
+                if not child.flattened:
+                    child.flatten()
+                children += child.children
+                continue
+
             try:
                 child.flatten()
             except AttributeError:
                 pass
+            children.append(child)
+        self.children = children
 
         if isinstance(self.parent, InstructionList):
             log_indentation(green(f"Flattened {self.type_repr()}, {id(self)} into parent {self.parent.type_repr()}, {id(self.parent)}"))
             for c in self.children:
                 c.parent = self.parent
-            try:
-                i = self.parent.children.index(self)
-            except Exception as e:
-                print(e)
-            self.parent.children = self.parent.children[:i] + self.children + self.parent.children[i + 1:]
+            # the parent puts the children in place of this InstructionList
+            self.flattened = True
         else:
             log_indentation(f"{red('NOT')} flattening {cyan(f'{self.type_repr()}')}, {id(self)} into parent {cyan(f'{self.parent.type_repr()}')}, {id(self.parent)}")
             self.flat = True
@@ -908,6 +987,13 @@ class InstructionList(IRInstruction):
 
         return InstructionList(parent=self.parent, children=new_children, flat=self.flat, symtab=self.symtab)
 
+    def clone(self):
+        new = super().clone()
+        new.children = [child.clone() for child in self.children]
+        for child in new.children:
+            child.parent = new
+        return new
+
 
 # DEFINITIONS
 
@@ -933,6 +1019,13 @@ class Block(IRInstruction):
 
         return Block(parent=self.parent, global_symtab=self.global_symtab, local_symtab=self.local_symtab, defs=new_defs, body=new_body)
 
+    def clone(self):
+        """The nested function definitions are not cloned"""
+        new = super().clone()
+        new.body = self.body.clone()
+        new.body.parent = new
+        return new
+
 
 class FunctionDef(IRInstruction):
     def __init__(self, parent=None, symbol=None, parameters=[], body=None, returns=[], called_by_counter=0):
@@ -953,6 +1046,12 @@ class FunctionDef(IRInstruction):
 
         return FunctionDef(parent=self.parent, symbol=self.symbol, parameters=self.parameters, body=new_body, returns=self.returns, called_by_counter=self.called_by_counter)
 
+    def clone(self):
+        new = super().clone()
+        new.body = self.body.clone()
+        new.body.parent = new
+        return new
+
 
 class DefinitionList(IRInstruction):
     def __init__(self, parent=None, children=None):
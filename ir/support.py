@@ -5,48 +5,75 @@ the same thing in this compiler).
 These functions expose high level interfaces (passes) for actions that can be
 applied to multiple IR nodes."""
 
+from frontend.ast import NODE_ATTRIBUTES
 from ir.function_tree import FunctionTree
 from logger import log_indentation, green, underline
+import logger
 
 
-def get_node_list(root, quiet=True):
-    """Get a list of all nodes in the AST"""
+# Returns the nodes that navigate visits from this node, in the same order
+def get_navigated_nodes(node):
+    nodes = list(getattr(node, 'children', []))
+    for attr in NODE_ATTRIBUTES:
+        nodes.append(getattr(node, attr, None))
 
-    def register_nodes(left):
-        """Navigation action: get a list of all nodes"""
-        def right(node):
-            if node not in left:
-                left.append(node)
+    return [x for x in nodes if getattr(type(x), 'navigate', None) is not None]
 
-        return right
+
+def get_node_list(root):
+    """Get a list of all nodes in the AST, in the same order in which
+    navigate visits them; the visit uses an explicit stack instead of
+    recursion, and the ids of the nodes already in the list are kept in a
+    set, to check them in constant time"""
 
     node_list = []
-    FunctionTree.navigate(register_nodes(node_list), quiet=quiet)
+    seen = set()
+
+    for function_node in FunctionTree.get_function_nodes():
+        # (node, True) once all the nodes navigated from it have been visited
+        stack = [(function_node.definition.body.body, False)]
+        while stack:
+            node, visited = stack.pop()
+            if not visited:
+                stack.append((node, True))
+                stack += [(x, False) for x in reversed(get_navigated_nodes(node))]
+            elif id(node) not in seen:
+                seen.add(id(node))
+                node_list.append(node)
+
     return node_list
 
 
 def lowering(node):
     """Navigation action: lowering
     (convert AST nodes into IR instructions)"""
+    lower = getattr(type(node), 'lower', None)
+    if lower is None:
+        if logger.log_enabled:
+            log_indentation(underline(f"Lowering not yet implemented for type {node.type_repr()}"))
+        return
+
     try:
-        check = node.lower()
-        log_indentation(green(f"Lowered {node.type_repr()}, {id(node)}"))
-        if not check:
-            raise RuntimeError(f"Node {repr(node)} did not return anything after lowering")
+        check = lower(node)
     except AttributeError as e:
-        if e.name == "lower":
-            log_indentation(underline(f"Lowering not yet implemented for type {node.type_repr()}"))
-        else:
-            raise RuntimeError(e)
+        raise RuntimeError(e)
+
+    if logger.log_enabled:
+        log_indentation(green(f"Lowered {node.type_repr()}, {id(node)}"))
+    if not check:
+        raise RuntimeError(f"Node {repr(node)} did not return anything after lowering")
 
 
 def flattening(node):
     """Navigation action: flattening
     (nested InstructionList nodes are flattened into a single InstructionList)"""
+    flatten = getattr(type(node), 'flatten', None)
+    if flatten is None:
+        if logger.log_enabled:
+            log_indentation(underline(f"Flattening not yet implemented for type {node.type_repr()}"))
+        return
+
     try:
-        node.flatten()
+        flatten(node)
     except AttributeError as e:
-        if e.name == "flatten":
-            log_indentation(underline(f"Flattening not yet implemented for type {node.type_repr()}"))
-        else:
-            raise RuntimeError(e)
+        raise RuntimeError(e)
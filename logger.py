@@ -4,9 +4,15 @@
 Mainly used to add indentations and ANSI formatting"""
 
 
-def initialize_logger():
-    global indentation
+# when the log is disabled, log_indentation doesn't print anything; the
+# callers logging every node can check log_enabled to skip building messages
+log_enabled = True
+
+
+def initialize_logger(enabled=True):
+    global indentation, log_enabled
     indentation = 0
+    log_enabled = enabled
 
 
 def logger(f):
@@ -28,6 +34,9 @@ def logger(f):
 
 
 def log_indentation(str):
+    if not log_enabled:
+        return
+
     str = str.replace("\n", f"\n{' ' * indentation * 4}")
     print(f"{' ' * indentation * 4}{str}")
 
@@ -73,48 +82,31 @@ def ANSI(code, str):
     return f"{CODE[code]}{str}{RST}"
 
 
-def black(str):
-    return ANSI("BLACK", str)
-
-
-def red(str):
-    return ANSI("RED", str)
-
-
-def green(str):
-    return ANSI("GREEN", str)
-
-
-def yellow(str):
-    return ANSI("YELLOW", str)
-
+# Returns a function that wraps a string in the given ANSI code; the escape
+# sequence is looked up once here, instead of every time a string is wrapped
+def formatter(code):
+    prefix = CODE[code]
+    if prefix is None:
+        return lambda str: str
 
-def blue(str):
-    return ANSI("BLUE", str)
+    def wrap(str):
+        return f"{prefix}{str}{RST}"
 
+    return wrap
 
-def magenta(str):
-    return ANSI("MAGENTA", str)
 
+black = formatter("BLACK")
+red = formatter("RED")
+green = formatter("GREEN")
+yellow = formatter("YELLOW")
+blue = formatter("BLUE")
+magenta = formatter("MAGENTA")
+cyan = formatter("CYAN")
+white = formatter("WHITE")
 
-def cyan(str):
-    return ANSI("CYAN", str)
-
-
-def white(str):
-    return ANSI("WHITE", str)
-
-
-def bold(str):
-    return ANSI("BOLD", str)
-
-
-def italic(str):
-    return ANSI("ITALIC", str)
-
-
-def underline(str):
-    return ANSI("UNDERLINE", str)
+bold = formatter("BOLD")
+italic = formatter("ITALIC")
+underline = formatter("UNDERLINE")
 
 
 def h1(str):
@@ -129,7 +121,13 @@ def h3(str):
     return f"\n{CODE['BOLD']}{CODE['UNDERLINE']}{str}{RST}\n"
 
 
+# All the codes begin with BASE: most strings (like the output of the
+# programs) have none of them, and are returned without scanning them again
+# for each code
 def remove_formatting(str):
+    if BASE not in str:
+        return str
+
     str = str.replace(RST, "")
     for code in CODE.values():
         str = str.replace(code, "")
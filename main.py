@@ -5,6 +5,7 @@
 from argparse import ArgumentParser
 from os.path import join, exists
 from copy import deepcopy
+from io import StringIO
 
 from frontend.lexer import Lexer
 from frontend.parser import Parser
@@ -30,12 +31,13 @@ from logger import initialize_logger, h1, h2, remove_formatting, green, yellow,
 
 # These can be specified from the command line to get the corresponding
 # debug information printed to file
-debug_info_choices = ["pre_opts_ast", "ast_ftree", "loop_unrolling", "post_opts_ast", "interpreter_output", "pre_opts_ir", "memory_to_register_promotion", "function_inlining", "post_opts_ir", "dead_variable_elimination", "chain_load_store_elimination", "post_cfg_ir", "cfg", "cfg_dot", "ftree", "pre_opts_code", "code"]
+debug_info_choices = ["pre_opts_ast", "ast_ftree", "loop_unrolling", "array_scalarization", "post_opts_ast", "interpreter_output", "pre_opts_ir", "memory_to_register_promotion", "function_inlining", "redundant_load_elimination", "dead_store_elimination", "post_opts_ir", "dead_variable_elimination", "chain_load_store_elimination", "post_cfg_ir", "cfg", "cfg_dot", "ftree", "pre_opts_code", "remove_redundant_fills", "code"]
 
 
 # Returns a dictionary with all the debug informations, like the AST,
-# the IR, the FunctionTree, the CFG, the actual code, etc.
-def compile_program(text, optimization_level, interpret):
+# the IR, the FunctionTree, the CFG, the actual code, etc.; the graphviz
+# representation of the CFG is only built if cfg_dot is True
+def compile_program(text, optimization_level, interpret, cfg_dot=False):
     debug_info = {}
 
     print(h1("FRONT-END"))
@@ -66,20 +68,25 @@ def compile_program(text, optimization_level, interpret):
     debug_info["post_opts_ast"] = deepcopy(program)
 
     print(h2("NODE LIST"))
-    node_list = get_node_list(program, quiet=True)
+    node_list = get_node_list(program)
+    # one line per node: build the output and print it all at once
+    output = StringIO()
     for node in node_list:
         if node.parent is not None:
-            print(f"{yellow(f'{node.type_repr()}, {id(node)}')} is child of {yellow(f'{node.parent.type_repr()}, {id(node.parent)}')}")
+            output.write(f"{yellow(f'{node.type_repr()}, {id(node)}')} is child of {yellow(f'{node.parent.type_repr()}, {id(node.parent)}')}\n")
         else:
-            print(f"{yellow(f'{node.type_repr()}, {id(node)}')} is {bold('root')} node")
-    print(f"\nTotal nodes in IR: {cyan(len(node_list))}")
+            output.write(f"{yellow(f'{node.type_repr()}, {id(node)}')} is {bold('root')} node\n")
+    output.write(f"\nTotal nodes in IR: {cyan(len(node_list))}\n")
+    print(output.getvalue(), end='')
 
     print(h2("STATEMENT LISTS"))
+    output = StringIO()
     for node in node_list:
         try:
-            print(f"{bold(node.get_content())}")
+            output.write(f"{bold(node.get_content())}\n")
         except AttributeError:
             pass  # not a StatList
+    print(output.getvalue(), end='')
 
     if interpret:
         print(h2("INTERPRETER"))
@@ -96,17 +103,20 @@ def compile_program(text, optimization_level, interpret):
     FunctionTree.navigate(lowering, quiet=False)
 
     print(h2("FLATTENING"))
-    FunctionTree.navigate(flattening, quiet=False)
+    # after lowering, each function body is a single InstructionList that
+    # flattens all the nested ones: there's no need to navigate the tree again
+    for function_node in FunctionTree.get_function_nodes():
+        flattening(function_node.definition.body.body)
 
     print(f"\n{green('Intermediate Representation:')}\n{program}")
-    debug_info["pre_opts_ir"] = deepcopy(program)
+    debug_info["pre_opts_ir"] = program.clone()
 
     # XXX: OTHER OPTIMIZATIONS GO HERE
     print(h2("INTERMEDIATE REPRESENTATION OPTIMIZATIONS"))
     perform_intermediate_representation_optimizations(program, optimization_level, debug_info)
 
     print(f"\n{green('Optimized program:')}\n{program}")
-    debug_info["post_opts_ir"] = deepcopy(program)
+    debug_info["post_opts_ir"] = program.clone()
 
     ##############################################
 
@@ -120,10 +130,11 @@ def compile_program(text, optimization_level, interpret):
     cfg = perform_control_flow_graph_optimizations(program, cfg, optimization_level, debug_info)
 
     print(f"\n{green('Optimized program:')}\n{program}")
-    debug_info["post_cfg_ir"] = deepcopy(program)
+    debug_info["post_cfg_ir"] = program.clone()
 
     debug_info['cfg'] = cfg
-    debug_info['cfg_dot'] = cfg.cfg_to_dot()
+    if cfg_dot:
+        debug_info['cfg_dot'] = cfg.cfg_to_dot()
 
     print(h2("NEW FUNCTION TREE"))
     FunctionTree.populate_function_tree(program, main_symbol)
@@ -149,11 +160,13 @@ def compile_program(text, optimization_level, interpret):
     code = generate_code(program, register_allocation)
     printable_code = '\n'.join([repr(x) for x in code]) + '\n'
     print(f"\n{green('Final compiled code: ')}\n\n{printable_code}")
-    debug_info["pre_opts_code"] = deepcopy(code)
+    # the post-code-generation optimizations only insert, remove or replace
+    # ASMInstructions in the list, they never modify the existing ones
+    debug_info["pre_opts_code"] = list(code)
 
     # XXX: THE LAST OPTIMIZATIONS GO HERE
     print(h2("POST-CODE-GENERATION OPTIMIZATIONS"))
-    code = perform_post_code_generation_optimizations(code, optimization_level)
+    code = perform_post_code_generation_optimizations(code, optimization_level, debug_info)
     printable_code = '\n'.join([repr(x) for x in code]) + '\n'
     print(f"\n{green('Final optimized code: ')}\n\n{printable_code}")
     debug_info["code"] = code
@@ -173,12 +186,11 @@ def put_debug_info_in_file(debug_info, print_debug, debug_directory):
             continue
 
         filename = f"{join(debug_directory, info)}.debug"
-        output = remove_formatting(repr(debug_info[info]))
         match info:
             case "interpreter_output":
                 output = debug_info[info]
 
-            case "loop_unrolling" | "memory_to_register_promotion" | "function_inlining" | "dead_variable_elimination" | "chain_load_store_elimination" | "cfg":
+            case "loop_unrolling" | "array_scalarization" | "memory_to_register_promotion" | "function_inlining" | "redundant_load_elimination" | "dead_store_elimination" | "dead_variable_elimination" | "chain_load_store_elimination" | "remove_redundant_fills" | "cfg":
                 # print list using newlines
                 output = remove_formatting('\n'.join([repr(x) for x in debug_info[info]]))
 
@@ -190,6 +202,11 @@ def put_debug_info_in_file(debug_info, print_debug, debug_directory):
                 output = remove_formatting('\n'.join([repr(x) for x in debug_info[info]]) + '\n')
                 filename = f"{join(debug_directory, info)}.s"
 
+            case _:
+                # only the remaining debug info is printed whole, the repr of
+                # a full program or AST is expensive to build
+                output = remove_formatting(repr(debug_info[info]))
+
         with open(f"{filename}", 'w') as debugf:
             debugf.write(output)
 
@@ -203,14 +220,16 @@ def driver_main():
     parser.add_argument('-I', '--interpret', default=False, action='store_true')
     parser.add_argument('-p', '--print_debug', default="", choices=debug_info_choices, nargs='+', help="What debug info to print to a file in the debug directory")
     parser.add_argument('-d', '--debug_directory', default="./debug")
+    parser.add_argument('-q', '--quiet', default=False, action='store_true', help="Don't log the visit of each node of the tree")
 
     args = parser.parse_args()
+    initialize_logger(enabled=not args.quiet)
 
     # get a test program from the arguments
     with open(args.input_file, 'r') as inf:
         test_program = inf.read()
 
-    debug_info = compile_program(test_program, int(args.optimization_level), args.interpret)
+    debug_info = compile_program(test_program, int(args.optimization_level), args.interpret, cfg_dot="cfg_dot" in args.print_debug)
     put_debug_info_in_file(debug_info, args.print_debug, args.debug_directory)
 
     if not args.interpret:
@@ -222,5 +241,4 @@ def driver_main():
 
 
 if __name__ == '__main__':
-    initialize_logger()
     driver_main()
@@ -1,16 +1,18 @@
+import pytest
+
 from tests.utils import run_test, check_expected_output
 
 
 class TestArithmetic():
 
-    def test_division(self, optimization_level, interpreter, debug_executable):
-        output, debug_info = run_test("tests/arithmetic/00.division/code.pl0", int(optimization_level), interpreter, debug_executable)
-        check_expected_output(output, "tests/arithmetic/00.division/expected")
-
-    def test_modulus(self, optimization_level, interpreter, debug_executable):
-        output, debug_info = run_test("tests/arithmetic/01.modulus/code.pl0", int(optimization_level), interpreter, debug_executable)
-        check_expected_output(output, "tests/arithmetic/01.modulus/expected")
+    @pytest.mark.parametrize("test", ["00.division", "01.modulus", "02.increment"])
+    def test_arithmetic(self, test, optimization_level, interpreter, debug_executable):
+        output, debug_info = run_test(f"tests/arithmetic/{test}/code.pl0", optimization_level, interpreter, debug_executable)
+        check_expected_output(output, f"tests/arithmetic/{test}/expected")
 
-    def test_increment(self, optimization_level, interpreter, debug_executable):
-        output, debug_info = run_test("tests/arithmetic/02.increment/code.pl0", int(optimization_level), interpreter, debug_executable)
-        check_expected_output(output, "tests/arithmetic/02.increment/expected")
+    # the divisors of these moduli die at the modulus, so the register
+    # allocator can give their registers to the results
+    @pytest.mark.not_interpreter
+    def test_modulus_dead_divisor(self, optimization_level, interpreter, debug_executable):
+        output, debug_info = run_test("tests/arithmetic/03.modulus_dead_divisor/code.pl0", optimization_level, interpreter, debug_executable)
+        check_expected_output(output, "tests/arithmetic/03.modulus_dead_divisor/expected")
@@ -1,20 +1,11 @@
+import pytest
+
 from tests.utils import run_test, check_expected_output
 
 
 class TestIfConstruct():
 
-    def test_simple_if_else(self, optimization_level, interpreter, debug_executable):
-        output, debug_info = run_test("tests/basic_constructs/if_construct/00.simple_if_else/code.pl0", int(optimization_level), interpreter, debug_executable)
-        check_expected_output(output, "tests/basic_constructs/if_construct/00.simple_if_else/expected")
-
-    def test_if_elif_else(self, optimization_level, interpreter, debug_executable):
-        output, debug_info = run_test("tests/basic_constructs/if_construct/01.simple_if_elif_else/code.pl0", int(optimization_level), interpreter, debug_executable)
-        check_expected_output(output, "tests/basic_constructs/if_construct/01.simple_if_elif_else/expected")
-
-    def test_switch_with_if_else(self, optimization_level, interpreter, debug_executable):
-        output, debug_info = run_test("tests/basic_constructs/if_construct/02.switch_with_if_else/code.pl0", int(optimization_level), interpreter, debug_executable)
-        check_expected_output(output, "tests/basic_constructs/if_construct/02.switch_with_if_else/expected")
-
-    def test_if_else_with_shared_variable(self, optimization_level, interpreter, debug_executable):
-        output, debug_info = run_test("tests/basic_constructs/if_construct/03.if_else_with_shared_variable/code.pl0", int(optimization_level), interpreter, debug_executable)
-        check_expected_output(output, "tests/basic_constructs/if_construct/03.if_else_with_shared_variable//expected")
+    @pytest.mark.parametrize("test", ["00.simple_if_else", "01.simple_if_elif_else", "02.switch_with_if_else", "03.if_else_with_shared_variable"])
+    def test_if_construct(self, test, optimization_level, interpreter, debug_executable):
+        output, debug_info = run_test(f"tests/basic_constructs/if_construct/{test}/code.pl0", optimization_level, interpreter, debug_executable)
+        check_expected_output(output, f"tests/basic_constructs/if_construct/{test}/expected")
@@ -1,22 +1,32 @@
 import pytest
 
+from tests import utils
+
 
 def pytest_addoption(parser):
-    parser.addoption('-O', '--optimization_level', choices=["0", "1", "2"], default=["2"], help="Optimization Level")
+    parser.addoption('-O', '--optimization_level', choices=["0", "1", "2"], default="2", help="Optimization Level")
     parser.addoption('-I', '--interpreter', default=[False], action='store_const', const=[True], help="Interpret the AST instead of compiling")
     parser.addoption('-D', '--debug_executable', default=[False], action='store_const', const=[True], help="Execute the program using a debugger")
+    parser.addoption('--all_configurations', default=False, action='store_true', help="Run the tests with all the optimization levels, both compiling and interpreting")
+    parser.addoption('--compile_cache', default=False, action='store_true', help="Reuse the compilation results of the previous runs, if the compiler and the programs didn't change")
 
 
 def pytest_generate_tests(metafunc):
+    all_configurations = metafunc.config.getoption("all_configurations")
+
+    # the optimization level is converted once here, instead of in every test
     if "optimization_level" in metafunc.fixturenames:
-        metafunc.parametrize("optimization_level", metafunc.config.getoption("optimization_level"))
+        optimization_levels = [0, 1, 2] if all_configurations else [int(metafunc.config.getoption("optimization_level"))]
+        metafunc.parametrize("optimization_level", optimization_levels)
     if "interpreter" in metafunc.fixturenames:
-        metafunc.parametrize("interpreter", metafunc.config.getoption("interpreter"))
+        metafunc.parametrize("interpreter", [False, True] if all_configurations else metafunc.config.getoption("interpreter"))
     if "debug_executable" in metafunc.fixturenames:
         metafunc.parametrize("debug_executable", metafunc.config.getoption("debug_executable"))
 
 
 def pytest_configure(config):
+    utils.compile_cache_enabled = config.getoption("compile_cache")
+
     config.addinivalue_line("markers", "not_optimization_level_zero: can't run test at -O0")
     config.addinivalue_line("markers", "not_optimization_level_one: can't run test at -O1")
     config.addinivalue_line("markers", "not_optimization_level_two: can't run test at -O2")
@@ -25,36 +35,22 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "not_compiler: can't run test on compiler")  # XXX: this is useless
 
 
+SKIP_OPTIMIZATION_LEVEL_MARKERS = ["not_optimization_level_zero", "not_optimization_level_one", "not_optimization_level_two"]
+
+
 # Add markers allowing tests to be skipped based on optimization level and if they are
-# being interpreted or compiled
+# being interpreted or compiled; the configuration is read from the parameters of each
+# test, so that all the configurations can be collected and run together
 def pytest_collection_modifyitems(config, items):
-    optimization_level = int(config.getoption("--optimization_level"))
-
-    if optimization_level == 0:
-        skip_if_optimization_level_zero = pytest.mark.skip(reason="optimization level must not be 0")
-        for item in items:
-            if "not_optimization_level_zero" in item.keywords:
-                item.add_marker(skip_if_optimization_level_zero)
-    elif optimization_level == 1:
-        skip_if_optimization_level_one = pytest.mark.skip(reason="optimization level must not be 1")
-        for item in items:
-            if "not_optimization_level_one" in item.keywords:
-                item.add_marker(skip_if_optimization_level_one)
-    elif optimization_level == 2:
-        skip_if_optimization_level_two = pytest.mark.skip(reason="optimization level must not be 2")
-        for item in items:
-            if "not_optimization_level_two" in item.keywords:
-                item.add_marker(skip_if_optimization_level_two)
-
-    interpreter = config.getoption("--interpreter")[0]
-
-    if interpreter:
-        skip_if_interpreter = pytest.mark.skip(reason="can't run test on interpreter")
-        for item in items:
-            if "not_interpreter" in item.keywords:
-                item.add_marker(skip_if_interpreter)
-    else:
-        skip_if_compiler = pytest.mark.skip(reason="can't run test on compiler")
-        for item in items:
-            if "not_compiler" in item.keywords:
-                item.add_marker(skip_if_compiler)
+    for item in items:
+        params = item.callspec.params if hasattr(item, "callspec") else {}
+
+        optimization_level = params.get("optimization_level")
+        if optimization_level is not None and SKIP_OPTIMIZATION_LEVEL_MARKERS[optimization_level] in item.keywords:
+            item.add_marker(pytest.mark.skip(reason=f"optimization level must not be {optimization_level}"))
+
+        interpreter = params.get("interpreter")
+        if interpreter is True and "not_interpreter" in item.keywords:
+            item.add_marker(pytest.mark.skip(reason="can't run test on interpreter"))
+        elif interpreter is False and "not_compiler" in item.keywords:
+            item.add_marker(pytest.mark.skip(reason="can't run test on compiler"))
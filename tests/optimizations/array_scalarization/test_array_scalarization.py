@@ -0,0 +1,48 @@
+import pytest
+
+from tests.utils import run_test, check_expected_output
+
+from frontend.abstract_syntax_tree_optimizations.array_scalarization import MAX_ELEMENTS_TO_SCALARIZE
+
+
+@pytest.mark.not_optimization_level_zero
+@pytest.mark.not_optimization_level_one
+class TestArrayScalarization():
+
+    def test_array_scalarization(self, optimization_level, interpreter, debug_executable):
+        output, debug_info = run_test("tests/optimizations/array_scalarization/00.array_scalarization/code.pl0", optimization_level, interpreter, debug_executable)
+        check_expected_output(output, "tests/optimizations/array_scalarization/00.array_scalarization/expected")
+
+        scalarized_arrays = {array.name: array for array in debug_info['array_scalarization']}
+
+        # local, global and multidimensional arrays are scalarized, as is
+        # an array that is never used
+        assert sorted(scalarized_arrays) == ["clashing_array__1", "global_array", "local_array", "matrix"]
+        assert scalarized_arrays["local_array"].alloc_class == "auto"
+        assert scalarized_arrays["global_array"].alloc_class == "global"
+
+        # the scalarized arrays are replaced by their elements, the others stay
+        symbols = {symbol.name: symbol for symbol in debug_info['post_opts_ast'].body.local_symtab}
+        assert "global_array" not in symbols
+        assert "global_array__0" in symbols and "global_array__1" in symbols
+        assert "matrix" not in symbols
+        assert all([f"matrix__{i}_{j}" in symbols for i in range(2) for j in range(3)])
+        assert not symbols["global_array__0"].is_array()
+
+        # accessed with a non constant index
+        assert "escaping_array" in symbols
+
+        # too many elements
+        assert "big_array" in symbols
+        assert symbols["big_array"].type.dims == [MAX_ELEMENTS_TO_SCALARIZE + 1]
+
+        # its elements would clash with another variable
+        assert "clashing_array" in symbols
+
+        # the elements, unlike the arrays, can then be promoted to registers
+        if not interpreter:
+            promoted_symbols = [symbol.name for old_symbol, symbol in debug_info['memory_to_register_promotion']]
+            for element in ["global_array__0", "global_array__1", "matrix__1_2", "local_array__0", "local_array__3"]:
+                assert element in promoted_symbols
+            for array in ["global_array", "local_array", "escaping_array", "big_array", "clashing_array"]:
+                assert array not in promoted_symbols
@@ -11,7 +11,7 @@ from ir.ir import LoadInstruction
 class TestChainLoadStoreElimination():
 
     def test_chain_load_store_elimination(self, optimization_level, interpreter, debug_executable):
-        output, debug_info = run_test("tests/optimizations/chain_load_store_elimination/00.chain_load_store_elimination/code.pl0", int(optimization_level), interpreter, debug_executable)
+        output, debug_info = run_test("tests/optimizations/chain_load_store_elimination/00.chain_load_store_elimination/code.pl0", optimization_level, interpreter, debug_executable)
         check_expected_output(output, "tests/optimizations/chain_load_store_elimination/00.chain_load_store_elimination/expected")
 
         # check that the inlining is actually inlining
@@ -27,6 +27,6 @@ class TestChainLoadStoreElimination():
 
     def test_useless_function(self, optimization_level, interpreter, debug_executable):
         with pytest.raises(RuntimeError) as e:
-            compile("tests/optimizations/chain_load_store_elimination/01.useless_function/code.pl0", int(optimization_level), interpreter)
+            compile("tests/optimizations/chain_load_store_elimination/01.useless_function/code.pl0", optimization_level, interpreter)
 
         check_expected_output(f"{str(e.value)}\n", "tests/optimizations/chain_load_store_elimination/01.useless_function/expected_error")
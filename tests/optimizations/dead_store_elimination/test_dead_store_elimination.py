@@ -0,0 +1,30 @@
+import pytest
+
+from tests.utils import run_test, check_expected_output, get_instructions
+
+from ir.ir import StoreInstruction
+
+
+@pytest.mark.not_optimization_level_zero
+@pytest.mark.not_optimization_level_one
+@pytest.mark.not_interpreter
+class TestDeadStoreElimination():
+
+    def test_dead_store_elimination(self, optimization_level, interpreter, debug_executable):
+        output, debug_info = run_test("tests/optimizations/dead_store_elimination/00.dead_store_elimination/code.pl0", optimization_level, interpreter, debug_executable)
+        check_expected_output(output, "tests/optimizations/dead_store_elimination/00.dead_store_elimination/expected")
+
+        # the first store to g in overwrite, which is stored again right
+        # after, and, once overwrite is inlined, the initial store to h and
+        # all the stores to g but the last one in main
+        removed_stores = debug_info['dead_store_elimination']
+        assert len(removed_stores) == 5
+
+        for store in removed_stores:
+            assert type(store) is StoreInstruction
+        assert [store.dest.name for store in removed_stores] == ["g", "h", "g", "g", "g"]
+
+        # check that the stores are actually removed
+        instructions = get_instructions(debug_info['post_opts_ir'])
+        for store in removed_stores:
+            assert repr(store) not in instructions
@@ -2,6 +2,8 @@ import pytest
 
 from tests.utils import run_test, check_expected_output
 
+from ir.intermediate_representation_optimizations.function_inlining import MAX_INSTRUCTION_TO_INLINE, MAX_LEAF_INSTRUCTION_TO_INLINE, MAX_SINGLE_CALL_INSTRUCTION_TO_INLINE
+
 
 @pytest.mark.not_optimization_level_zero
 @pytest.mark.not_optimization_level_one
@@ -9,16 +11,17 @@ from tests.utils import run_test, check_expected_output
 class TestFunctionInlining():
 
     def test_function_inlining(self, optimization_level, interpreter, debug_executable):
-        output, debug_info = run_test("tests/optimizations/function_inlining/00.function_inlining/code.pl0", int(optimization_level), interpreter, debug_executable)
+        output, debug_info = run_test("tests/optimizations/function_inlining/00.function_inlining/code.pl0", optimization_level, interpreter, debug_executable)
         check_expected_output(output, "tests/optimizations/function_inlining/00.function_inlining/expected")
 
         # check that the inlining is actually inlining
         check_expected_output(repr(debug_info['ast_ftree']), "tests/optimizations/function_inlining/00.function_inlining/ast_ftree.expected")
         check_expected_output(repr(debug_info['ftree']), "tests/optimizations/function_inlining/00.function_inlining/ftree.expected")
 
-        assert len(debug_info['function_inlining']) == 11
+        assert len(debug_info['function_inlining']) == 12
 
-        # check that all functions are inlined into 'function_not_to_inline' except it
+        # check that all functions are inlined into 'function_not_to_inline' except it,
+        # since it's too big and it's called twice
         for info in debug_info['function_inlining']:
             if info[0].symbol.name == "function_not_to_inline":
                 assert info[1] == "Too many instructions"
@@ -26,7 +29,7 @@ class TestFunctionInlining():
                 assert info[1].name == "function_not_to_inline"
 
     def test_inline_functions_in_main(self, optimization_level, interpreter, debug_executable):
-        output, debug_info = run_test("tests/optimizations/function_inlining/01.inline_functions_in_main/code.pl0", int(optimization_level), interpreter, debug_executable)
+        output, debug_info = run_test("tests/optimizations/function_inlining/01.inline_functions_in_main/code.pl0", optimization_level, interpreter, debug_executable)
         check_expected_output(output, "tests/optimizations/function_inlining/01.inline_functions_in_main/expected")
 
         # check that the inlining is actually inlining
@@ -40,23 +43,68 @@ class TestFunctionInlining():
             assert info[1].name == "main"
 
     def test_remove_inlined_functions(self, optimization_level, interpreter, debug_executable):
-        output, debug_info = run_test("tests/optimizations/function_inlining/02.remove_inlined_functions/code.pl0", int(optimization_level), interpreter, debug_executable)
+        output, debug_info = run_test("tests/optimizations/function_inlining/02.remove_inlined_functions/code.pl0", optimization_level, interpreter, debug_executable)
         check_expected_output(output, "tests/optimizations/function_inlining/02.remove_inlined_functions/expected")
 
         # check that the inlining is actually inlining
         check_expected_output(repr(debug_info['ast_ftree']), "tests/optimizations/function_inlining/02.remove_inlined_functions/ast_ftree.expected")
         check_expected_output(repr(debug_info['ftree']), "tests/optimizations/function_inlining/02.remove_inlined_functions/ftree.expected")
 
-        assert len(debug_info['function_inlining']) == 4
+        assert len(debug_info['function_inlining']) == 6
 
+        # the big functions are called twice, so they are not inlined
         assert debug_info['function_inlining'][0][0].symbol.name == "not_inline_2"
         assert debug_info['function_inlining'][0][1] == "Too many instructions"
+        assert debug_info['function_inlining'][1][0].symbol.name == "not_inline_2"
+        assert debug_info['function_inlining'][1][1] == "Too many instructions"
+
+        assert debug_info['function_inlining'][2][0].symbol.name == "inline_2"
+        assert debug_info['function_inlining'][2][1].name == "inline_1"
+
+        assert debug_info['function_inlining'][3][0].symbol.name == "inline_1"
+        assert debug_info['function_inlining'][3][1].name == "not_inline_1"
 
-        assert debug_info['function_inlining'][1][0].symbol.name == "inline_2"
-        assert debug_info['function_inlining'][1][1].name == "inline_1"
+        assert debug_info['function_inlining'][4][0].symbol.name == "not_inline_1"
+        assert debug_info['function_inlining'][4][1] == "Too many instructions"
+        assert debug_info['function_inlining'][5][0].symbol.name == "not_inline_1"
+        assert debug_info['function_inlining'][5][1] == "Too many instructions"
 
-        assert debug_info['function_inlining'][2][0].symbol.name == "inline_1"
-        assert debug_info['function_inlining'][2][1].name == "not_inline_1"
+    def test_inlining_thresholds(self, optimization_level, interpreter, debug_executable):
+        output, debug_info = run_test("tests/optimizations/function_inlining/03.inlining_thresholds/code.pl0", optimization_level, interpreter, debug_executable)
+        check_expected_output(output, "tests/optimizations/function_inlining/03.inlining_thresholds/expected")
 
-        assert debug_info['function_inlining'][3][0].symbol.name == "not_inline_1"
-        assert debug_info['function_inlining'][3][1] == "Too many instructions"
+        check_expected_output(repr(debug_info['ast_ftree']), "tests/optimizations/function_inlining/03.inlining_thresholds/ast_ftree.expected")
+        check_expected_output(repr(debug_info['ftree']), "tests/optimizations/function_inlining/03.inlining_thresholds/ftree.expected")
+
+        # where each call of each function ended up, and the size of the function
+        decisions = {}
+        sizes = {}
+        for info in debug_info['function_inlining']:
+            name = info[0].symbol.name
+            decisions.setdefault(name, []).append(info[1] if type(info[1]) is str else info[1].name)
+            sizes[name] = len(info[0].body.body.children)
+
+        # a leaf function is inlined everywhere, if it's small enough
+        assert MAX_INSTRUCTION_TO_INLINE <= sizes["leaf"] < MAX_LEAF_INSTRUCTION_TO_INLINE
+        assert decisions["leaf"] == ["main", "main"]
+
+        assert MAX_LEAF_INSTRUCTION_TO_INLINE <= sizes["big_leaf"] < MAX_SINGLE_CALL_INSTRUCTION_TO_INLINE
+        assert decisions["big_leaf"] == ["Too many instructions"] * 3
+
+        # a function called once is inlined even if it calls other functions
+        assert MAX_LEAF_INSTRUCTION_TO_INLINE <= sizes["single_call"] < MAX_SINGLE_CALL_INSTRUCTION_TO_INLINE
+        assert decisions["single_call"] == ["main"]
+
+        assert sizes["big_single_call"] >= MAX_SINGLE_CALL_INSTRUCTION_TO_INLINE
+        assert decisions["big_single_call"] == ["Too many instructions"]
+
+        # called twice and not a leaf, only the smallest functions are inlined
+        assert MAX_INSTRUCTION_TO_INLINE <= sizes["not_leaf"] < MAX_LEAF_INSTRUCTION_TO_INLINE
+        assert decisions["not_leaf"] == ["Too many instructions"] * 2
+
+        # 'outer' is called once, but after inlining 'middle' it calls 'inner',
+        # which is nested in it: it can't be moved into main
+        assert decisions["middle"] == ["outer"]
+        assert decisions["inner"] == ["Too many instructions"] * 2
+        assert MAX_INSTRUCTION_TO_INLINE <= sizes["outer"] < MAX_SINGLE_CALL_INSTRUCTION_TO_INLINE
+        assert decisions["outer"] == ["Too many instructions"]
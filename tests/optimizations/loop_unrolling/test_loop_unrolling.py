@@ -10,7 +10,7 @@ from frontend.abstract_syntax_tree_optimizations.loop_unrolling import LOOP_UNRO
 class TestLoopUnrolling():
 
     def test_loop_unrolling(self, optimization_level, interpreter, debug_executable):
-        output, debug_info = run_test("tests/optimizations/loop_unrolling/00.loop_unrolling/code.pl0", int(optimization_level), interpreter, debug_executable)
+        output, debug_info = run_test("tests/optimizations/loop_unrolling/00.loop_unrolling/code.pl0", optimization_level, interpreter, debug_executable)
         check_expected_output(output, "tests/optimizations/loop_unrolling/00.loop_unrolling/expected")
 
         # check that the loop is actually unrolled
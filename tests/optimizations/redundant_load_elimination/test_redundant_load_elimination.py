@@ -0,0 +1,35 @@
+import pytest
+
+from tests.utils import run_test, check_expected_output, get_instructions
+
+from ir.ir import LoadInstruction, StoreInstruction
+
+
+@pytest.mark.not_optimization_level_zero
+@pytest.mark.not_optimization_level_one
+@pytest.mark.not_interpreter
+class TestRedundantLoadElimination():
+
+    def test_redundant_load_elimination(self, optimization_level, interpreter, debug_executable):
+        output, debug_info = run_test("tests/optimizations/redundant_load_elimination/00.redundant_load_elimination/code.pl0", optimization_level, interpreter, debug_executable)
+        check_expected_output(output, "tests/optimizations/redundant_load_elimination/00.redundant_load_elimination/expected")
+
+        # every load of g and h follows a store or a load of the same
+        # variable, both in store_and_load and where it's inlined in main
+        replaced_loads = debug_info['redundant_load_elimination']
+        assert len(replaced_loads) == 12
+
+        for load, move in replaced_loads:
+            assert type(load) is LoadInstruction
+            assert load.source.name in ["g", "h"]
+
+            # the value is moved from the register that already holds it
+            assert type(move) is StoreInstruction
+            assert move.dest == load.dest
+            assert move.source.alloc_class == "reg"
+
+        # check that the loads are actually replaced
+        instructions = get_instructions(debug_info['post_opts_ir'])
+        for load, move in replaced_loads:
+            assert repr(load) not in instructions
+            assert repr(move) in instructions
@@ -0,0 +1,33 @@
+import pytest
+
+from tests.utils import run_test, check_expected_output
+
+
+@pytest.mark.not_optimization_level_zero
+@pytest.mark.not_optimization_level_one
+@pytest.mark.not_interpreter
+class TestRemoveRedundantFills():
+
+    def test_remove_redundant_fills(self, optimization_level, interpreter, debug_executable):
+        output, debug_info = run_test("tests/optimizations/remove_redundant_fills/00.remove_redundant_fills/code.pl0", optimization_level, interpreter, debug_executable)
+        check_expected_output(output, "tests/optimizations/remove_redundant_fills/00.remove_redundant_fills/expected")
+
+        # the first five variables are spilled as soon as they are defined,
+        # and filled right after in another register to compute the next one
+        replaced_fills = debug_info['remove_redundant_fills']
+        assert len(replaced_fills) == 5
+
+        pre_opts_code = debug_info['pre_opts_code']
+        for fill, move in replaced_fills:
+            # the fill follows the spill of the same frame slot
+            spill = pre_opts_code[pre_opts_code.index(fill) - 1]
+            assert fill.instruction == 'ldr'
+            assert spill.instruction == 'str'
+            assert fill.args[1] == spill.args[1]
+
+            # the registers are different, so the value is moved
+            assert move.instruction == 'mov'
+            assert move.args == [fill.args[0], spill.args[0]]
+
+            assert fill not in debug_info['code']
+            assert move in debug_info['code']
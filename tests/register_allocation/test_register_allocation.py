@@ -0,0 +1,41 @@
+from array import array
+
+from backend.regalloc import linear_scan, SPILL_FLAG
+
+
+# 2 registers are reserved for the spills, so only 2 of these are allocated
+NREGS = 4
+
+
+# The intervals are given as (start, end) pairs, sorted by start point
+def allocate(intervals):
+    starts = array('i', [start for start, end in intervals])
+    ends = array('i', [end for start, end in intervals])
+    registers, num_spill = linear_scan(starts, ends, NREGS)
+    return list(registers), num_spill
+
+
+class TestRegisterAllocation():
+
+    def test_no_spills(self):
+        assert allocate([(0, 2), (1, 3), (3, 4)]) == ([0, 1, 0], 0)
+
+    def test_spill_active_interval(self):
+        # the first interval ends after the current one: it's spilled and
+        # the current one takes its register
+        assert allocate([(0, 10), (1, 3), (2, 5)]) == ([SPILL_FLAG, 1, 0], 1)
+
+    def test_spill_current_interval(self):
+        # the current interval ends last, so it's the one to be spilled
+        assert allocate([(0, 3), (1, 4), (2, 10)]) == ([0, 1, SPILL_FLAG], 1)
+
+    def test_spill_latest_started_interval(self):
+        # the two active intervals end together: the latest started is spilled
+        assert allocate([(0, 10), (1, 10), (2, 5)]) == ([0, SPILL_FLAG, 1], 1)
+
+    def test_spilled_interval_does_not_expire(self):
+        # the first interval is spilled, so when it would have ended its
+        # register, by then assigned to other intervals, is not freed again:
+        # one of the last three intervals must still be spilled
+        intervals = [(0, 10), (1, 3), (2, 5), (4, 6), (7, 8), (11, 12), (11, 12), (11, 12)]
+        assert allocate(intervals) == ([SPILL_FLAG, 1, 0, 1, 1, 1, 0, SPILL_FLAG], 2)
@@ -7,17 +7,31 @@ Testing platform
 import pytest
 
 from argparse import ArgumentParser
+from importlib.util import find_spec
 
 
-default_args = ["--show-capture=no", "--no-header", "--tb=line"]
+# the runs with many tests only report the failures: the cache (only used to
+# rerun the failed tests) and the warnings plugins are disabled
+default_args = ("--show-capture=no", "--no-header", "--tb=line", "-p", "no:cacheprovider", "-p", "no:warnings")
+
+# the tests are independent, so if pytest-xdist is installed they are run in
+# parallel, by default one process per core; a single test is always run alone
+parallel = find_spec("xdist") is not None
+
+
+# The options selecting the configuration the tests are run with
+def configuration_args(optimization_level, interpret):
+    args = [f"--optimization_level={optimization_level}"]
+    args += ["-I"] if interpret else []
+
+    return args
 
 
 def single_test(test, optimization_level, interpret, quiet, debug):
     args = ["-v"]
 
     args += [] if quiet else ["-s"]
-    args += [f"--optimization_level={optimization_level}"]
-    args += ["-I"] if interpret else []
+    args += configuration_args(optimization_level, interpret)
     args += ["-D"] if debug else []
 
     args += ["-k", test]
@@ -27,10 +41,7 @@ def single_test(test, optimization_level, interpret, quiet, debug):
 
 
 def single_category(category, optimization_level, interpret):
-    args = default_args[:]
-
-    args += [f"--optimization_level={optimization_level}"]
-    args += ["-I"] if interpret else []
+    args = [*default_args, *configuration_args(optimization_level, interpret)]
 
     args += ["-k", category]
 
@@ -38,10 +49,7 @@ def single_category(category, optimization_level, interpret):
 
 
 def single_directory(directory, optimization_level, interpret):
-    args = default_args[:]
-
-    args += [f"--optimization_level={optimization_level}"]
-    args += ["-I"] if interpret else []
+    args = [*default_args, *configuration_args(optimization_level, interpret)]
 
     args += [directory]
 
@@ -49,24 +57,20 @@ def single_directory(directory, optimization_level, interpret):
 
 
 def test_all(optimization_level, interpret):
-    args = default_args[:]
-
-    args += [f"--optimization_level={optimization_level}"]
-    args += ["-I"] if interpret else []
+    args = [*default_args, *configuration_args(optimization_level, interpret)]
 
     pytest.main(args)
 
 
+# All the configurations are run in a single pytest session, so that the
+# tests are only collected once
 def test_all_all():
-    args = default_args[:]
+    print("All optimization levels, compiling and interpreting")
+    pytest.main([*default_args, "--all_configurations"])
 
-    for optimization_level in ["0", "1", "2"]:
-        print(f"Optimization level {optimization_level}, compiling")
-        pytest.main(args + [f"--optimization_level={optimization_level}"])
 
-    for optimization_level in ["0", "1", "2"]:
-        print(f"Optimization level {optimization_level}, interpreting")
-        pytest.main(args + [f"--optimization_level={optimization_level}", "-I"])
+def print_configuration(optimization_level, interpret):
+    print(f"Optimization level {optimization_level}, {'compiling' if not interpret else 'interpreting'}")
 
 
 def main():
@@ -83,31 +87,39 @@ def main():
     parser.add_argument('-O', '--optimization_level', default="2", choices=["0", "1", "2"])
     parser.add_argument('-I', '--interpret', default=False, action='store_true')
     parser.add_argument('-q', '--quiet', default=False, action='store_true', help="Only considered if testing a single test (-t), otherwise automatically set to true")
+    parser.add_argument('-C', '--compile_cache', default=False, action='store_true', help="Reuse the compilation results of the previous runs, if the compiler and the programs didn't change (a single test (-t) is always compiled)")
+    parser.add_argument('-j', '--jobs', default="auto", help="Number of processes running the tests in parallel, if pytest-xdist is installed (default: one per core)")
     parser.add_argument('-D', '--debug', default=False, action='store_true', help="Only considered if testing a single test (-t), otherwise automatically set to false: execute the program using a debugger")
 
     args = parser.parse_args()
 
+    global default_args
+    if parallel:
+        default_args += ("-n", args.jobs)
+    if args.compile_cache:
+        default_args += ("--compile_cache",)
+
     if args.test is not None:
         print(f"TESTING {args.test}")
-        print(f"Optimization level {args.optimization_level}, {'compiling' if not args.interpret else 'interpreting'}")
+        print_configuration(args.optimization_level, args.interpret)
         single_test(args.test, args.optimization_level, args.interpret, args.quiet, args.debug)
         return
 
     if args.category is not None:
         print(f"TESTING CATEGORY {args.category}")
-        print(f"Optimization level {args.optimization_level}, {'compiling' if not args.interpret else 'interpreting'}")
+        print_configuration(args.optimization_level, args.interpret)
         single_category(args.category, args.optimization_level, args.interpret)
         return
 
     if args.directory is not None:
         print(f"TESTING DIRECTORY {args.directory}")
-        print(f"Optimization level {args.optimization_level}, {'compiling' if not args.interpret else 'interpreting'}")
+        print_configuration(args.optimization_level, args.interpret)
         single_directory(args.directory, args.optimization_level, args.interpret)
         return
 
     elif args.all:
         print("TESTING ALL")
-        print(f"Optimization level {args.optimization_level}, {'compiling' if not args.interpret else 'interpreting'}")
+        print_configuration(args.optimization_level, args.interpret)
         test_all(args.optimization_level, args.interpret)
         return
 
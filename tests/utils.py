@@ -1,15 +1,97 @@
+from atexit import register
+from functools import cache
 from glob import glob
+from hashlib import blake2b
+from os import access, environ, makedirs, remove, replace, statvfs, W_OK, ST_RDONLY, ST_NOEXEC
+from os.path import exists, getmtime, join
+from pathlib import Path
+from pickle import dump, load, PicklingError
 from subprocess import run
-from tempfile import NamedTemporaryFile
+from sys import version
+from tempfile import NamedTemporaryFile, gettempdir
 
 from main import compile_program
 from logger import initialize_logger, remove_formatting
 
 
+# The object file and the executable are only read once: unless TMPDIR
+# chooses another directory, they are written to a tmpfs when there is one,
+# so that they never reach the disk; qemu maps the executable, so the
+# filesystem must allow execution
+def get_temporary_directory(tmpfs="/dev/shm"):
+    if "TMPDIR" in environ:
+        return None
+
+    try:
+        flags = statvfs(tmpfs).f_flag
+    except OSError:
+        return None
+
+    if flags & (ST_RDONLY | ST_NOEXEC) or not access(tmpfs, W_OK):
+        return None
+
+    return tmpfs
+
+
+TEMPORARY_DIRECTORY = get_temporary_directory()
+
+# With --compile_cache the results of the compilations are saved here, and
+# reused by the next runs (see conftest.py)
+COMPILE_CACHE_DIRECTORY = join(TEMPORARY_DIRECTORY or gettempdir(), "ple0com-compile-cache")
+compile_cache_enabled = False
+
+
+# Every change to the compiler must invalidate the saved results: they are
+# identified by the content of all its sources (everything but the tests)
+# and by the python version, which pickles them; the sources are found from
+# the root of the repository, wherever the tests are run from
+@cache
+def get_compiler_stamp():
+    root = Path(__file__).resolve().parent.parent
+    stamp = blake2b(version.encode())
+    for source in sorted(root.glob("**/*.py")):
+        relative_source = source.relative_to(root)
+        if relative_source.parts[0] != "tests":
+            stamp.update(relative_source.as_posix().encode())
+            stamp.update(source.read_bytes())
+
+    return stamp.hexdigest()
+
+
+def get_compile_cache_file(test_program, optimization_level, interpreted):
+    key = blake2b(f"{get_compiler_stamp()} {optimization_level} {interpreted}\n{test_program}".encode(), digest_size=16)
+    return join(COMPILE_CACHE_DIRECTORY, f"{key.hexdigest()}.pickle")
+
+
+# The result is written to a temporary file and then renamed, so that a
+# parallel test never reads it half written; if it can't be saved, the
+# temporary file is removed
+def save_compile_result(debug_info, cache_file):
+    makedirs(COMPILE_CACHE_DIRECTORY, exist_ok=True)
+
+    temporary_file = NamedTemporaryFile(mode="wb", dir=COMPILE_CACHE_DIRECTORY, delete=False)
+    try:
+        with temporary_file:
+            dump(debug_info, temporary_file)
+        replace(temporary_file.name, cache_file)
+    except (PicklingError, RecursionError) as e:
+        print(f"Can't save the compilation result: {repr(e)}")
+    finally:
+        if exists(temporary_file.name):
+            remove(temporary_file.name)
+
+
 # Returns the assembly code produced by the compiler or raises an Error
 def compile(in_file, optimization_level, interpreted):
-    with open(in_file, 'r') as inf:
-        test_program = inf.read()
+    test_program = read_test_file(in_file, getmtime(in_file))
+
+    cache_file = None
+    if compile_cache_enabled:
+        cache_file = get_compile_cache_file(test_program, optimization_level, interpreted)
+        if exists(cache_file):
+            print(f"Reusing the compilation result saved in {cache_file}")
+            with open(cache_file, 'rb') as f:
+                return load(f)
 
     initialize_logger()
 
@@ -19,29 +101,51 @@ def compile(in_file, optimization_level, interpreted):
         print(f"Raised Exception {repr(e)}")
         raise e
 
+    if cache_file is not None:
+        save_compile_result(debug_info, cache_file)
+
     return debug_info
 
 
-# Assemble, link and execute the compiled code, return the stdout of the asembled program
-def execute(out_file, object_file, executable_file, debug):
-    assemble_bin = "arm-linux-gnueabi-as"
-    assemble_flags = "-g -march=armv6"
-    stdlib_files = ' '.join(glob("stdlib/*.s"))
-    assemble_command = f"{assemble_bin} {assemble_flags} {out_file.name} {stdlib_files} -o {object_file.name}"
-    run(assemble_command.split(' '))
+# The commands are lists of arguments, so that the file names are passed
+# as they are, even if they contain spaces
+ASSEMBLE_COMMAND = ["arm-linux-gnueabi-as", "-g", "-march=armv6"]
+LINK_COMMAND = ["arm-linux-gnueabi-ld"]
+EXECUTE_COMMAND = ["qemu-arm", "-cpu", "arm1136"]
+
+
+# The stdlib is the same for every test: assemble it once per process; the
+# object file is deleted when the process exits. If the assembly fails an
+# exception is raised, so that the missing object file isn't cached
+@cache
+def assemble_stdlib():
+    stdlib_object_file = NamedTemporaryFile(mode="w+", suffix=".o", dir=TEMPORARY_DIRECTORY)
+    register(stdlib_object_file.close)
+
+    run([*ASSEMBLE_COMMAND, *glob("stdlib/*.s"), "-o", stdlib_object_file.name], check=True)
+
+    return stdlib_object_file
+
+
+# Assemble (reading the code from the standard input), link with the stdlib
+# and execute the compiled code, return the stdout of the assembled program
+def execute(code, object_file, executable_file, debug):
+    stdlib_object_file = assemble_stdlib()
 
-    linker_bin = "arm-linux-gnueabi-ld"
-    linker_command = f"{linker_bin} {object_file.name} -o {executable_file.name}"
-    run(linker_command.split(' '))
+    run([*ASSEMBLE_COMMAND, "-", "-o", object_file.name], input=code.encode('utf-8'))
 
-    execute_command = f"qemu-arm -cpu arm1136 {executable_file.name}"
+    run([*LINK_COMMAND, object_file.name, stdlib_object_file.name, "-o", executable_file.name])
+
+    execute_command = [*EXECUTE_COMMAND, executable_file.name]
     if debug:  # open gdb port 7777
-        execute_command = f"qemu-arm -cpu arm1136 -g 7777 {executable_file.name}"
+        execute_command = [*EXECUTE_COMMAND, "-g", "7777", executable_file.name]
         print(f"Start a debugger in another terminal with `make -s dbg EXECUTABLE=\"{executable_file.name}\"")
-    execute = run(execute_command.split(' '), capture_output=True)
+    # the output is decoded while it's read, like the expected files it is
+    # compared to; invalid characters are shown in the difference instead of
+    # raising an exception
+    execute = run(execute_command, capture_output=True, encoding='utf-8', errors='replace')
 
-    output = execute.stdout.decode('utf-8')
-    return output
+    return execute.stdout
 
 
 # Returns and prints the output of the compiled/interpreted test + the debug information
@@ -51,21 +155,14 @@ def run_test(in_file, optimization_level, interpreted, debug):
     if interpreted:
         output = debug_info['interpreter_output']
     else:
-        out_temp_file = NamedTemporaryFile(mode="w+", suffix=".s")
-        executable_temp_file = NamedTemporaryFile(mode="w+")
-        object_temp_file = NamedTemporaryFile(mode="w+")
-
         code = debug_info['code']
         printable_code = '\n'.join([repr(x) for x in code]) + '\n'
 
-        out_temp_file.write(remove_formatting(printable_code))
-        out_temp_file.seek(0)
-
-        output = execute(out_temp_file, object_temp_file, executable_temp_file, debug)
-
-        out_temp_file.close()
-        object_temp_file.close()
-        executable_temp_file.close()
+        # the code is piped to the assembler, only the object file and the
+        # executable are written; they are closed (and deleted) even if the
+        # execution fails
+        with NamedTemporaryFile(mode="w+", dir=TEMPORARY_DIRECTORY) as object_temp_file, NamedTemporaryFile(mode="w+", dir=TEMPORARY_DIRECTORY) as executable_temp_file:
+            output = execute(remove_formatting(printable_code), object_temp_file, executable_temp_file, debug)
 
         print("\n\033[36mOUTPUT\033[0m\n")
         print(output)
@@ -73,9 +170,27 @@ def run_test(in_file, optimization_level, interpreted, debug):
     return output, debug_info
 
 
+# The same programs are compiled, and the same expected files are checked,
+# by each optimization level and by both the compiler and the interpreter:
+# read them once, using their modification time as part of the key so that
+# edited files are read again
+@cache
+def read_test_file(test_file, modification_time):
+    with open(test_file, 'r') as f:
+        return f.read()
+
+
 # Check that the given output is equal as the content of the expected_file
 def check_expected_output(output, expected_file):
-    with open(expected_file, 'r') as exp:
-        expected = exp.read()
+    expected = read_test_file(expected_file, getmtime(expected_file))
 
     assert remove_formatting(output) == expected
+
+
+# Returns the representations of the instructions of a function and of all
+# the functions nested in it, to check which ones survived the optimizations
+def get_instructions(function_definition):
+    instructions = [repr(instruction) for instruction in function_definition.body.body.children]
+    for nested_definition in function_definition.body.defs.children:
+        instructions += get_instructions(nested_definition)
+    return instructions